@@ -0,0 +1,112 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Thread-safe in-process LRU of user objects with a per-entry TTL.
+    Keys are stringified ids, since token claims may carry the id as a string.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user, ttl):
+        user_id = str(user_id)
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves ``request.user`` from ``user_cache`` instead
+    of querying the user table on every request.
+
+    Token validation (signature, expiry, token type) is unchanged. Users are
+    evicted on save/delete in this process (see ``signals.py``); other
+    processes pick up changes within ``AUTH_USER_CACHE_TTL`` seconds. The
+    is-active and password-revocation checks still run on every hit.
+    """
+
+    def get_user(self, validated_token):
+        ttl = settings.AUTH_USER_CACHE_TTL
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not ttl or user_id is None:
+            return super().get_user(validated_token)
+
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, ttl)
+        else:
+            self.check_user(user, validated_token)
+        # Views may mutate request.user; never hand out the shared instance.
+        return copy.copy(user)
+
+    async def aauthenticate(self, request):
+        """
+        ``authenticate()`` for async views: token checks are CPU-only and a
+        cache hit needs no database, so only a miss hops to a thread.
+        """
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if settings.AUTH_USER_CACHE_TTL and user_id else None
+        if user is None:
+            return await sync_to_async(self.get_user)(validated_token), validated_token
+        self.check_user(user, validated_token)
+        return copy.copy(user), validated_token
+
+    def check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+
+from .hashers import run_hashing
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that verifies passwords on the bounded hashing pool.
+
+    Database access stays on the request thread; only the hash runs in the
+    pool. Hashes that use outdated parameters are upgraded after a
+    successful login, as ``User.check_password`` would do.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway to keep timing close to the existing-user path.
+            run_hashing(make_password, password)
+            return
+        is_correct, must_update = run_hashing(verify_password, password, user.password)
+        if not (is_correct and self.user_can_authenticate(user)):
+            return
+        if must_update:
+            user.password = run_hashing(make_password, password)
+            user.save(update_fields=["password"])
+        return user
@@ -0,0 +1,70 @@
+"""
+Cache-backed refresh-token blacklist lookups.
+
+Every blacklisted jti is mirrored into the shared cache (see ``signals.py``)
+with a TTL equal to the token's remaining lifetime. Once the cache has been
+warmed from the database, "not in the cache" means "not blacklisted", so the
+common case (a valid token) costs one cache round-trip and no query.
+
+A cache under memory pressure can evict single jti keys, which would turn a
+blacklisted token back into an accepted one. The warm marker therefore
+expires after TOKEN_BLACKLIST_WARM_SECONDS (shorter than a refresh token
+lives): an eviction goes unnoticed for at most that long before the next
+rebuild, and with Redis' volatile-ttl policy the marker is evicted before
+any jti key.
+
+Only enable this with a cache shared by every worker (Redis): with a
+per-process cache, a token blacklisted in one worker would still be accepted
+by the others.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+KEY_PREFIX = "jwt:blacklist:"
+WARM_KEY = "jwt:blacklist:warm"
+WARMING_KEY = "jwt:blacklist:warming"
+
+
+def _cache():
+    alias = settings.TOKEN_BLACKLIST_CACHE
+    return caches[alias] if alias else None
+
+
+def remember(jti, expires_at):
+    cache = _cache()
+    if cache is None:
+        return
+    ttl = int((expires_at - timezone.now()).total_seconds())
+    if ttl > 0:
+        cache.set(KEY_PREFIX + jti, 1, ttl)
+
+
+def warm(cache):
+    """Load every unexpired blacklisted jti, then mark the cache as complete."""
+    entries = (
+        BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        .values_list("token__jti", "token__expires_at")
+        .iterator(chunk_size=2000)
+    )
+    for jti, expires_at in entries:
+        remember(jti, expires_at)
+    cache.set(WARM_KEY, 1, settings.TOKEN_BLACKLIST_WARM_SECONDS)
+
+
+def is_blacklisted(jti):
+    cache = _cache()
+    if cache is None:
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+    found = cache.get_many([WARM_KEY, KEY_PREFIX + jti])
+    if WARM_KEY not in found:
+        # Cold, flushed or due for a rebuild: answer from the database, and
+        # let one caller at a time reload the cache.
+        if cache.add(WARMING_KEY, 1, settings.TOKEN_BLACKLIST_WARM_SECONDS):
+            try:
+                warm(cache)
+            finally:
+                cache.delete(WARMING_KEY)
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+    return KEY_PREFIX + jti in found
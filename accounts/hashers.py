@@ -0,0 +1,52 @@
+"""
+Password hashing cost and concurrency controls.
+
+``PBKDF2PasswordHasher`` reads its iteration count from
+``settings.PASSWORD_PBKDF2_ITERATIONS``. Stored hashes with a different count
+are re-encoded on the next successful login (Django's ``must_update``), so
+the cost can be tuned up or down without resetting passwords.
+
+``run_hashing`` runs hashing work on a bounded thread pool so a burst of
+logins can't oversubscribe the CPU. It only caps how many hashes run at
+once: the calling request thread still waits for its result. Callers that
+can't get a slot within ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds get
+``HashingBusy``, which the auth views and ``HashingBusyMiddleware`` (for
+every other login, such as the admin's) answer with 503, so a burst is shed
+instead of holding workers in the queue.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from tasktrackerAPI.metrics import timed
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    # Same algorithm name, so existing pbkdf2_sha256 hashes keep verifying.
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
+
+
+class HashingBusy(Exception):
+    pass
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+# Running plus queued jobs; beyond this, callers wait for a slot or give up.
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS * 2)
+
+
+def run_hashing(func, *args):
+    if not _slots.acquire(timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT):
+        raise HashingBusy("Password hashing is saturated.")
+    try:
+        with timed("hash"):
+            return _executor.submit(func, *args).result()
+    finally:
+        _slots.release()
@@ -0,0 +1,74 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure /user/login/ throughput and latency at different PBKDF2 "
+        "iteration counts. Creates and removes a throwaway user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations", type=int, nargs="+", default=[260_000, 600_000, 1_000_000]
+        )
+        parser.add_argument("--requests", type=int, default=40)
+        parser.add_argument("--concurrency", type=int, default=4)
+
+    def handle(self, *args, iterations, requests, concurrency, **options):
+        User = get_user_model()
+        username, password = f"bench-{uuid.uuid4().hex[:12]}", uuid.uuid4().hex
+        url = reverse("user_login")
+        user = User.objects.create(username=username)
+        try:
+            # Measure password hashing, not the per-username login throttle.
+            with override_settings(THROTTLING_ENABLED=False):
+                for count in iterations:
+                    with override_settings(PASSWORD_PBKDF2_ITERATIONS=count):
+                        user.password = make_password(password)
+                        user.save(update_fields=["password"])
+                        self._run(url, username, password, count, requests, concurrency)
+        finally:
+            user.delete()
+
+    def _run(self, url, username, password, count, requests, concurrency):
+        payload = {"username": username, "password": password}
+
+        def login(_):
+            started = time.perf_counter()
+            response = Client().post(url, payload, content_type="application/json")
+            elapsed = time.perf_counter() - started
+            connection.close()  # worker threads each opened their own connection
+            return response.status_code, elapsed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(login, range(requests)))
+        wall = time.perf_counter() - started
+
+        latencies = [elapsed * 1000 for status, elapsed in results if status == 200]
+        failures = len(results) - len(latencies)
+        if not latencies:
+            self.stderr.write(f"iterations={count}: every request failed")
+            return
+        self.stdout.write(
+            f"iterations={count:>9} "
+            f"throughput={len(latencies) / wall:7.1f} req/s "
+            f"p50={statistics.median(latencies):7.1f}ms "
+            f"p95={_percentile(latencies, 95):7.1f}ms "
+            f"failures={failures}"
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in small "
+        "batches, each in its own short transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches to give other writers room.",
+        )
+
+    def handle(self, *args, batch_size, pause, **options):
+        started = time.monotonic()
+        expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+        outstanding = blacklisted = 0
+        while True:
+            ids = list(expired.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                outstanding += OutstandingToken.objects.filter(pk__in=ids).delete()[0]
+            if pause:
+                time.sleep(pause)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"Deleted {outstanding} outstanding and {blacklisted} blacklisted "
+            f"tokens in {elapsed:.3f}s"
+        )
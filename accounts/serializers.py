@@ -1,10 +1,13 @@
 from django.contrib.auth import get_user_model, password_validation
+from django.contrib.auth.hashers import make_password
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from tasktrackerAPI.metrics import TimedSerializerMixin
+from .hashers import run_hashing
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("id", "username", "email", "first_name", "last_name")
@@ -27,5 +30,10 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop("password2", None)
         password = validated_data.pop("password")
-        user = User.objects.create_user(password=password, **validated_data)
+        # Same as create_user(), but the hash runs on the bounded hashing pool.
+        user = User(**validated_data)
+        user.username = User.normalize_username(user.username)
+        user.email = User.objects.normalize_email(user.email)
+        user.password = run_hashing(make_password, password)
+        user.save()
         return user
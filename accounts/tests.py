@@ -1,10 +1,20 @@
 # accounts/tests/test_accounts_views.py
+from datetime import timedelta
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse
-from django.test import tag
+from django.test import override_settings, tag
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 
+from accounts.blacklist import is_blacklisted
+from accounts.tokens import RefreshToken
+
 User = get_user_model()
 
 
@@ -15,6 +25,7 @@ class AccountsViewsTests(APITestCase):
     """
 
     def setUp(self):
+        cache.clear()  # throttle counters
         self.client = APIClient()
 
         # Named routes from your urls.py
@@ -119,6 +130,32 @@ class AccountsViewsTests(APITestCase):
         self.assertIn("user", res.data)
         self.assertEqual(res.data["user"]["username"], self.user.username)
 
+    @tag("login")
+    def test_login_upgrades_password_hash_cost(self):
+        """Login: a hash at the old PBKDF2 cost is re-encoded at the configured one."""
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            self._login_and_get_tokens()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split("$")[1], "1000")
+        self.assertTrue(self.user.check_password(self.password))
+
+    @tag("login")
+    def test_login_returns_503_when_hashing_is_saturated(self):
+        """Login: a full hashing pool answers 503 from the API and the admin login alike."""
+        from unittest import mock
+        from accounts.hashers import HashingBusy
+
+        with mock.patch("accounts.backends.run_hashing", side_effect=HashingBusy):
+            res = self.client.post(
+                self.url_login, {"username": self.user.username, "password": self.password}, format="json"
+            )
+            self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            res = self.client.post(
+                "/admin/login/", {"username": self.user.username, "password": self.password}
+            )
+            self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(res["Retry-After"], "1")
+
     @tag("login")
     def test_login_missing_fields(self):
         """Login: returns 400 if username or password is missing."""
@@ -135,6 +172,28 @@ class AccountsViewsTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED, msg=res.data)
         self.assertIn("detail", res.data)
 
+    @tag("login")
+    def test_login_throttled_per_username_and_ip(self):
+        """Login: repeated attempts on one account get 429, other accounts keep their own budget."""
+        from django.conf import settings
+
+        rates = dict(settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], auth="2/min", auth_ip="4/min")
+        wrong = {"username": self.user.username, "password": "wrong"}
+        with override_settings(REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates)):
+            for _ in range(2):
+                res = self.client.post(self.url_login, wrong, format="json")
+                self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            res = self.client.post(self.url_login, wrong, format="json")
+            self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn("Retry-After", res)
+
+            other = {"username": "someone-else", "password": "wrong"}
+            res = self.client.post(self.url_login, other, format="json")
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            # The IP budget (4) is now spent across both accounts.
+            res = self.client.post(self.url_login, other, format="json")
+            self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
     # ---------- Me ----------
     @tag("me")
     def test_me_requires_auth(self):
@@ -150,6 +209,25 @@ class AccountsViewsTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.data)
         self.assertEqual(res.data.get("username"), self.user.username)
 
+    @tag("me")
+    def test_me_serves_user_from_auth_cache(self):
+        """Me: repeat requests with the same token skip the user query."""
+        access, _ = self._login_and_get_tokens()
+        self.client.get(self.url_me, HTTP_AUTHORIZATION=f"Bearer {access}")
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url_me, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.data)
+
+    @tag("me")
+    def test_me_rejects_deactivated_cached_user(self):
+        """Me: deactivating a user evicts them from the auth cache."""
+        access, _ = self._login_and_get_tokens()
+        self.client.get(self.url_me, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(self.url_me, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
     # ---------- Logout ----------
     @tag("logout")
     def test_logout_requires_auth(self):
@@ -186,6 +264,61 @@ class AccountsViewsTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.data)
         self.assertIn("access", res.data)
 
+    @tag("refresh")
+    def test_rotated_refresh_token_is_rejected(self):
+        """Refresh: a rotated (blacklisted) refresh token cannot be reused."""
+        _, refresh = self._login_and_get_tokens()
+        res = self.client.post(self.url_refresh, {"refresh": refresh}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.data)
+        res = self.client.post(self.url_refresh, {"refresh": refresh}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED, msg=res.data)
+
+    @tag("refresh")
+    @override_settings(TOKEN_BLACKLIST_CACHE="default")
+    def test_rotated_refresh_token_is_rejected_from_cache(self):
+        """Refresh: blacklist lookups served from the cache still reject reuse."""
+        cache.clear()
+        _, refresh = self._login_and_get_tokens()
+        self.client.post(self.url_refresh, {"refresh": refresh}, format="json")
+        self.assertTrue(is_blacklisted(RefreshToken(refresh, verify=False)["jti"]))
+        res = self.client.post(self.url_refresh, {"refresh": refresh}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED, msg=res.data)
+
+    @tag("refresh")
+    @override_settings(TOKEN_BLACKLIST_CACHE="default", TOKEN_BLACKLIST_WARM_SECONDS=60)
+    def test_evicted_blacklist_entry_is_rebuilt(self):
+        """Refresh: a blacklisted jti evicted from the cache is caught by the next rebuild."""
+        import time
+        from unittest import mock
+        from accounts.blacklist import KEY_PREFIX
+
+        cache.clear()
+        _, refresh = self._login_and_get_tokens()
+        self.client.post(self.url_refresh, {"refresh": refresh}, format="json")
+        jti = RefreshToken(refresh, verify=False)["jti"]
+        self.assertTrue(is_blacklisted(jti))  # warms the cache
+        cache.delete(KEY_PREFIX + jti)        # evicted
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertTrue(is_blacklisted(jti))
+            self.assertTrue(is_blacklisted(jti))  # rebuilt: served from the cache again
+
+    @tag("refresh")
+    def test_prune_tokens_deletes_expired(self):
+        """prune_tokens: removes expired outstanding tokens and their blacklist rows."""
+        access, refresh = self._login_and_get_tokens()
+        self.client.post(
+            self.url_logout,
+            {"refresh": refresh},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {access}",
+        )
+        OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command("prune_tokens", "--batch-size", "1", stdout=out)
+        self.assertIn("Deleted 1 outstanding and 1 blacklisted", out.getvalue())
+        self.assertFalse(OutstandingToken.objects.exists())
+        self.assertFalse(BlacklistedToken.objects.exists())
+
     @tag("refresh")
     def test_token_refresh_requires_body(self):
         """Refresh: returns 400 if no refresh token is provided in the body."""
@@ -0,0 +1,19 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .blacklist import is_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    """RefreshToken whose blacklist check goes through ``blacklist.is_blacklisted``."""
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
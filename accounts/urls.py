@@ -1,11 +1,10 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
-from .views import LoginView, LogoutView, MeView, RegisterView
+from .views import LoginView, LogoutView, MeView, RefreshView, RegisterView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="user_register"),
     path("login/",    LoginView.as_view(),    name="user_login"),
-    path("refresh/",  TokenRefreshView.as_view(), name="token_refresh"),
+    path("refresh/",  RefreshView.as_view(),  name="token_refresh"),
     path("me/",       MeView.as_view(),       name="user_me"),
     path("logout/",   LogoutView.as_view(),   name="user_logout"),
 ]
@@ -3,19 +3,33 @@ from django.contrib.auth import authenticate, get_user_model
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+from .hashers import HashingBusy
 from .serializers import UserSerializer, RegisterSerializer
+from .tokens import RefreshToken
 
 User = get_user_model()
 
+
+def _busy():
+    return Response(
+        {"detail": "Server busy, try again shortly."},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "auth"
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        user = serializer.save()
+        try:
+            user = serializer.save()
+        except HashingBusy:
+            return _busy()
         # auto-issue tokens (optional)
         refresh = RefreshToken.for_user(user)
         return Response(
@@ -29,13 +43,17 @@ class RegisterView(APIView):
 
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "auth"
 
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
         if not username or not password:
             return Response({"detail": "Username and password required."}, status=400)
-        user = authenticate(request, username=username, password=password)
+        try:
+            user = authenticate(request, username=username, password=password)
+        except HashingBusy:
+            return _busy()
         if not user:
             return Response({"detail": "Invalid credentials."}, status=401)
         refresh = RefreshToken.for_user(user)
@@ -45,6 +63,9 @@ class LoginView(APIView):
             "user": UserSerializer(user).data,
         })
 
+class RefreshView(TokenRefreshView):
+    throttle_scope = "auth"
+
 class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     def get(self, request):
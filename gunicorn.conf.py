@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for both deployment profiles, selected by SERVER_MODE:
+
+- wsgi (default): sync workers running tasktrackerAPI.wsgi, optionally
+  threaded with GUNICORN_THREADS.
+- asgi: uvicorn workers running tasktrackerAPI.asgi, which serves task
+  list/detail reads from async views.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+if os.getenv("SERVER_MODE", "wsgi").lower() == "asgi":
+    wsgi_app = "tasktrackerAPI.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "tasktrackerAPI.wsgi:application"
+    threads = int(os.getenv("GUNICORN_THREADS", "1"))
@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from .search import ensure_index
+
+    connection = connections[using]
+    if "tasks_task" in connection.introspection.table_names():
+        ensure_index(connection)
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # SQLite table rebuilds drop the full-text triggers; restore them.
+        post_migrate.connect(ensure_search_index, sender=self)
@@ -0,0 +1,121 @@
+"""
+Async-native GET handlers for the task list/detail, used when the app is
+served over ASGI (settings.TASKS_ASYNC_VIEWS). They share parsing, ETag
+and serialization helpers with the DRF views in ``views.py`` and use the
+async ORM for every query, so a slow client or slow query holds an event
+loop slot rather than a worker thread. Writes and other methods are handed
+to the sync DRF views unchanged. Authentication and throttling follow the
+DRF settings, so both kinds of view answer 401 and 429 the same way.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from accounts.authentication import CachedJWTAuthentication
+
+from . import views
+from .models import Task
+from .serializers import TaskSerializer
+
+
+def _json(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+async def _authenticate(request):
+    """Set ``request.user``; return an error response if that isn't possible."""
+    auth = CachedJWTAuthentication()
+    try:
+        result = await auth.aauthenticate(request)
+    except exceptions.AuthenticationFailed as exc:
+        detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        result, error = None, detail
+    else:
+        error = {"detail": exceptions.NotAuthenticated.default_detail}
+    if result is None:
+        headers = {"WWW-Authenticate": auth.authenticate_header(request)}
+        return _json(error, status.HTTP_401_UNAUTHORIZED, headers)
+    request.user = result[0]
+    return None
+
+
+def _throttle(request):
+    """Run the configured throttles as APIView does; return a 429 response if any refuse."""
+    waits = []
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, None):
+            waits.append(throttle.wait())
+    if not waits:
+        return None
+    exc = exceptions.Throttled(max((w for w in waits if w is not None), default=None))
+    headers = {"Retry-After": "%d" % exc.wait} if exc.wait is not None else None
+    return _json({"detail": exc.detail}, status.HTTP_429_TOO_MANY_REQUESTS, headers)
+
+
+async def _check_request(request):
+    """Authenticate and throttle like the DRF views; an error response, or None."""
+    denied = await _authenticate(request)
+    if denied:
+        return denied
+    # Throttle counters live in the cache and are updated synchronously.
+    return await sync_to_async(_throttle)(request)
+
+
+@csrf_exempt
+async def task_list(request):
+    if request.method != "GET":
+        return await sync_to_async(views.task_list)(request)
+    denied = await _check_request(request)
+    if denied:
+        return denied
+
+    try:
+        # Filters may resolve names (category, owner) through the cache or
+        # database while building the queryset, so this runs off the loop.
+        fields, paginator, qs = await sync_to_async(views.list_query)(request)
+    except ValueError as exc:
+        return _json({"detail": str(exc)}, status.HTTP_400_BAD_REQUEST)
+
+    state = await qs.aaggregate(**views.LIST_STATE)
+    etag = await sync_to_async(views.list_etag)(request, state)
+    not_modified = views.conditional_response(request, etag, None)
+    if not_modified:
+        return not_modified
+
+    if views.fast_json(qs):
+        rows = [row async for row in views.fast_page_queryset(qs, fields, paginator)]
+        body = views.fast_list_body(rows, fields, paginator)
+        response = HttpResponse(body, content_type="application/json")
+    else:
+        rows = [task async for task in views.list_page_queryset(qs, fields, paginator)]
+        response = _json(views.list_data(rows, fields, paginator))
+    return views.with_validators(response, etag, None)
+
+
+@csrf_exempt
+async def task_detail(request, pk: int):
+    if request.method != "GET":
+        return await sync_to_async(views.task_detail)(request, pk=pk)
+    denied = await _check_request(request)
+    if denied:
+        return denied
+
+    try:
+        task = await Task.objects.visible_to(request.user).with_relations().aget(pk=pk)
+    except Task.DoesNotExist:
+        return _json({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+
+    etag = views.detail_etag(task)
+    not_modified = views.conditional_response(request, etag, task.updated_at)
+    if not_modified:
+        return not_modified
+    return views.with_validators(_json(TaskSerializer(task).data), etag, task.updated_at)
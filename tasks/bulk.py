@@ -0,0 +1,158 @@
+"""
+Set-based create/update/delete for many tasks in one transaction.
+
+These paths bypass ``Task.save()`` and the model signals, so they call
+``Task.sync_overdue()``, maintain owners/TaskMembership rows and invalidate
+the per-user task caches themselves.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_tasks, invalidate_users
+from .filters import MAX_ID
+from .models import Task, TaskMembership
+from .serializers import TaskSerializer
+
+MAX_OPERATIONS = 500
+
+Owner = Task.owners.through
+Role = TaskMembership.Role
+
+
+def _is_id(value):
+    # JSON true/false decode to bools, which isinstance() counts as ints.
+    return type(value) is int and 0 < value <= MAX_ID
+
+
+class BulkValidationError(Exception):
+    def __init__(self, errors):
+        super().__init__("Bulk payload is invalid.")
+        self.errors = errors
+
+
+def _split_owners(validated_data):
+    data = dict(validated_data)
+    return data, data.pop("owners", None)
+
+
+def set_owners(owner_map):
+    """Replace owners for ``{task_id: [user_id, ...]}`` with one DELETE + INSERT per table."""
+    if not owner_map:
+        return
+    task_ids = list(owner_map)
+    Owner.objects.filter(task_id__in=task_ids).delete()
+    TaskMembership.objects.filter(task_id__in=task_ids, role=Role.OWNER).delete()
+    pairs = [
+        (task_id, user_id)
+        for task_id, user_ids in owner_map.items()
+        for user_id in dict.fromkeys(user_ids)
+    ]
+    Owner.objects.bulk_create([Owner(task_id=t, user_id=u) for t, u in pairs])
+    TaskMembership.objects.bulk_create(
+        [TaskMembership(task_id=t, user_id=u, role=Role.OWNER) for t, u in pairs]
+    )
+
+
+def _validate(user, payload):
+    creates = payload.get("create") or []
+    updates = payload.get("update") or []
+    deletes = payload.get("delete") or []
+    if not all(isinstance(v, list) for v in (creates, updates, deletes)):
+        raise BulkValidationError({"detail": "create, update and delete must be lists."})
+    if len(creates) + len(updates) + len(deletes) > MAX_OPERATIONS:
+        raise BulkValidationError({"detail": f"At most {MAX_OPERATIONS} operations per request."})
+
+    if not all(_is_id(pk) for pk in deletes):
+        raise BulkValidationError({"detail": "delete must be a list of task ids."})
+    ids = [item.get("id") for item in updates if isinstance(item, dict)] + deletes
+    ids = [pk for pk in ids if _is_id(pk)]
+    if len(set(ids)) != len(ids):
+        raise BulkValidationError({"detail": "Each task id may appear only once."})
+    visible = Task.objects.visible_to(user).with_owners().in_bulk(ids)
+
+    errors = {"create": [], "update": [], "delete": []}
+    create_serializers, update_serializers = [], []
+    for item in creates:
+        serializer = TaskSerializer(data=item)
+        errors["create"].append({} if serializer.is_valid() else serializer.errors)
+        create_serializers.append(serializer)
+    for item in updates:
+        task = visible.get(item["id"]) if isinstance(item, dict) and _is_id(item.get("id")) else None
+        if task is None:
+            errors["update"].append({"id": ["Not found."]})
+            continue
+        data = {k: v for k, v in item.items() if k != "id"}
+        serializer = TaskSerializer(task, data=data, partial=True)
+        errors["update"].append({} if serializer.is_valid() else serializer.errors)
+        update_serializers.append(serializer)
+    for pk in deletes:
+        errors["delete"].append({} if pk in visible else {"id": ["Not found."]})
+
+    if any(e for group in errors.values() for e in group):
+        raise BulkValidationError(errors)
+    return create_serializers, update_serializers, deletes
+
+
+def _create(user, serializers, now):
+    tasks, owner_ids = [], []
+    for serializer in serializers:
+        data, owners = _split_owners(serializer.validated_data)
+        task = Task(created_by=user, **data)
+        task.sync_overdue(now)
+        tasks.append(task)
+        owner_ids.append([u.pk for u in owners] if owners else [user.pk])
+
+    Task.objects.bulk_create(tasks)
+    invalidate_users({user.pk}.union(*owner_ids))
+    TaskMembership.objects.bulk_create(
+        [TaskMembership(task=t, user=user, role=Role.CREATOR) for t in tasks]
+    )
+    set_owners({t.pk: ids for t, ids in zip(tasks, owner_ids)})
+    return [t.pk for t in tasks]
+
+
+def _update(user, serializers, now):
+    tasks, fields, owner_map = [], {"is_overdue", "updated_at"}, {}
+    for serializer in serializers:
+        task = serializer.instance
+        data, owners = _split_owners(serializer.validated_data)
+        for attr, value in data.items():
+            setattr(task, attr, value)
+        task.sync_overdue(now)
+        task.updated_at = now
+        fields.update(data)
+        tasks.append(task)
+        if owners is not None:
+            owner_map[task.pk] = [u.pk for u in owners] or [user.pk]
+        elif not task.owners.all():  # prefetched
+            owner_map[task.pk] = [user.pk]
+
+    if tasks:
+        new_owners = {pk for ids in owner_map.values() for pk in ids}
+        invalidate_tasks([t.pk for t in tasks], extra_user_ids=new_owners)
+        Task.objects.bulk_update(tasks, sorted(fields))
+    set_owners(owner_map)
+    return [t.pk for t in tasks]
+
+
+def apply_bulk(user, payload):
+    """
+    Apply ``{"create": [...], "update": [{"id": ..., ...}], "delete": [ids]}``
+    atomically. Returns ``{"created": [...], "updated": [...], "deleted": [...]}``
+    with serialized tasks in request order; raises BulkValidationError with
+    per-item errors (aligned with the request lists) if anything is invalid.
+    """
+    create_serializers, update_serializers, deletes = _validate(user, payload)
+    now = timezone.now()
+    with transaction.atomic():
+        created = _create(user, create_serializers, now)
+        updated = _update(user, update_serializers, now)
+        if deletes:
+            Task.objects.filter(pk__in=deletes).delete()
+
+    fetched = Task.objects.with_relations().in_bulk(created + updated)
+    return {
+        "created": TaskSerializer([fetched[pk] for pk in created], many=True).data,
+        "updated": TaskSerializer([fetched[pk] for pk in updated], many=True).data,
+        "deleted": deletes,
+    }
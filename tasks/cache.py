@@ -0,0 +1,114 @@
+"""
+Per-user cache versioning for task data.
+
+Every user has a version number that is bumped (after commit) whenever a
+task they can see changes. Cached values are keyed on that version, so
+invalidation is a single INCR per affected user and stale entries simply
+age out. Bumps only reach other processes through a shared cache; with the
+per-process fallback, versions expire after CACHE_VERSION_TIMEOUT instead.
+
+Categories are shared reference data with one global version, bumped on
+Category save/delete (see ``signals.py``).
+
+Values cached under a version are read from the primary database: a miss
+usually follows a write, and a lagging replica would otherwise fill the new
+version's entry with pre-write data.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from .models import Category, Task, TaskMembership
+
+CATEGORY_VERSION_KEY = "categories:version"
+
+
+def _version_key(user_id):
+    return f"tasks:version:{user_id}"
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a re-created key never reuses an old version.
+        cache.add(key, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+
+
+def get_task_version(user_id):
+    return _get_version(_version_key(user_id))
+
+
+def bump_task_versions(user_ids):
+    for user_id in set(user_ids):
+        _bump_version(_version_key(user_id))
+
+
+def member_ids(task_ids):
+    return set(
+        TaskMembership.objects.filter(task_id__in=task_ids).values_list("user_id", flat=True)
+    )
+
+
+def invalidate_users(user_ids):
+    """Bump versions for ``user_ids`` once the current transaction commits."""
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: bump_task_versions(user_ids))
+
+
+def invalidate_tasks(task_ids, extra_user_ids=()):
+    """Invalidate everyone who can currently see ``task_ids``, plus ``extra_user_ids``."""
+    invalidate_users(member_ids(task_ids) | set(extra_user_ids))
+
+
+def get_task_summary(user):
+    """TaskQuerySet.summary() for the user's visible tasks, cached per task version."""
+    timeout = settings.TASK_SUMMARY_CACHE_TIMEOUT
+    qs = Task.objects.visible_to(user)
+    if not timeout:
+        return qs.summary(timezone.now())
+    key = f"tasks:summary:{user.pk}:{get_task_version(user.pk)}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = qs.using(DEFAULT_DB_ALIAS).summary(timezone.now())
+        cache.set(key, summary, timeout)
+    return summary
+
+
+def get_category_version():
+    return _get_version(CATEGORY_VERSION_KEY)
+
+
+def invalidate_categories():
+    transaction.on_commit(lambda: _bump_version(CATEGORY_VERSION_KEY))
+
+
+def get_categories():
+    """All categories as ``[{"id", "name", "description"}]`` in name order, cached per version."""
+    timeout = settings.CATEGORY_CACHE_TIMEOUT
+    if not timeout:
+        return list(Category.objects.values("id", "name", "description"))
+    key = f"categories:list:{get_category_version()}"
+    categories = cache.get(key)
+    if categories is None:
+        categories = list(Category.objects.using(DEFAULT_DB_ALIAS).values("id", "name", "description"))
+        cache.set(key, categories, timeout)
+    return categories
+
+
+def category_ids_named(name):
+    """Ids of categories whose name matches ``name`` case-insensitively."""
+    name = name.casefold()
+    return [c["id"] for c in get_categories() if c["name"].casefold() == name]
@@ -0,0 +1,101 @@
+"""
+Bulk data factories for benchmarks and large-dataset tests.
+
+Rows are written with ``bulk_create`` in batches, so ``Task.save()`` and the
+model signals never run: like ``bulk.py``, these factories call
+``sync_overdue()`` and write owner and TaskMembership rows themselves.
+Output is deterministic for a given ``seed``.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Category, Task, TaskMembership
+
+Owner = Task.owners.through
+Role = TaskMembership.Role
+
+WORDS = (
+    "review deploy draft migrate refactor plan test fix update write "
+    "invoice report roadmap release backlog meeting client budget design audit"
+).split()
+
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).capitalize()
+
+
+def make_users(count, password="bench-pass-123", prefix="bench", batch_size=1000):
+    """Create ``count`` users sharing one password hash (hashed once)."""
+    User = get_user_model()
+    hashed = make_password(password)
+    users = [
+        User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", password=hashed)
+        for i in range(count)
+    ]
+    return User.objects.bulk_create(users, batch_size=batch_size)
+
+
+def make_categories(count, prefix="Category"):
+    return Category.objects.bulk_create([Category(name=f"{prefix} {i}") for i in range(count)])
+
+
+def make_tasks(users, per_user, categories=(), max_owners=3, seed=0, batch_size=1000):
+    """
+    Create ``per_user`` tasks for each user, each with 1..``max_owners``
+    owners drawn from ``users`` (the creator usually among them), plus the
+    matching creator and owner TaskMembership rows. Returns the task count.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    user_ids = [u.pk for u in users]
+    category_ids = [c.pk for c in categories] + [None]
+    chunk = max(1, batch_size // max(1, per_user))  # creators per transaction
+    total = 0
+    for start in range(0, len(user_ids), chunk):
+        creators = user_ids[start : start + chunk]
+        tasks, owner_ids = [], []
+        for creator in creators:
+            for _ in range(per_user):
+                due = now + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.7 else None
+                task = Task(
+                    title=_title(rng),
+                    description=_title(rng) if rng.random() < 0.5 else "",
+                    created_by_id=creator,
+                    priority=rng.choice(Task.Priority.values),
+                    state=rng.choice(Task.State.values),
+                    category_id=rng.choice(category_ids),
+                    due_date=due,
+                )
+                task.sync_overdue(now)
+                tasks.append(task)
+                owners = rng.sample(user_ids, min(len(user_ids), rng.randint(1, max_owners)))
+                if rng.random() < 0.8 and creator not in owners:
+                    owners[0] = creator
+                owner_ids.append(owners)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=batch_size)
+            pairs = [(t.pk, u) for t, ids in zip(tasks, owner_ids) for u in ids]
+            Owner.objects.bulk_create(
+                [Owner(task_id=t, user_id=u) for t, u in pairs], batch_size=batch_size
+            )
+            TaskMembership.objects.bulk_create(
+                [TaskMembership(task_id=t.pk, user_id=t.created_by_id, role=Role.CREATOR) for t in tasks]
+                + [TaskMembership(task_id=t, user_id=u, role=Role.OWNER) for t, u in pairs],
+                batch_size=batch_size,
+            )
+        total += len(tasks)
+    return total
+
+
+def seed(users=50, tasks_per_user=200, max_owners=3, categories=10, seed=0, password="bench-pass-123"):
+    """Populate an empty database; returns ``(users, categories, task_count)``."""
+    user_objs = make_users(users, password=password)
+    category_objs = make_categories(categories)
+    count = make_tasks(user_objs, tasks_per_user, category_objs, max_owners=max_owners, seed=seed)
+    return user_objs, category_objs, count
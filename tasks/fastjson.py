@@ -0,0 +1,146 @@
+"""
+Fast read path for task lists.
+
+Produces the same bytes as ``TaskSerializer(many=True)`` rendered by DRF's
+``JSONRenderer`` (compact separators, non-ASCII kept, U+2028/U+2029
+escaped, ISO-8601 datetimes with ``Z`` for UTC) while skipping the field
+machinery: rows come back as ``values_list()`` tuples, owner ids are
+aggregated by the database in a correlated subquery, and the result is
+encoded by orjson when it is installed (stdlib ``json`` otherwise).
+
+Used by the task list views (as ``PrerenderedResponse``) when
+TASK_LIST_FAST_JSON is on and the client negotiated JSON; ``supported()``
+is False for databases without an owner aggregate here, in which case the
+serializer path is used.
+"""
+import json
+
+from django.db import connections, models
+from django.db.models import Func
+from django.utils import timezone
+from rest_framework.response import Response
+
+from tasktrackerAPI.metrics import timed
+
+from .models import Task
+from .serializers import TaskSerializer
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+FIELDS = TaskSerializer.Meta.fields
+DATETIME_FIELDS = {"due_date", "created_at", "updated_at"}
+FOREIGN_KEYS = {"category": "category_id", "created_by": "created_by_id"}
+OWNERS_TABLE = Task.owners.through._meta.db_table
+
+
+class OwnerIds(Func):
+    """Owner ids of the task (ordered by id) as one correlated subquery per row."""
+
+    output_field = models.Field()
+    template = (
+        f"ARRAY(SELECT user_id FROM {OWNERS_TABLE} "
+        f"WHERE task_id = %(expressions)s ORDER BY user_id)"
+    )
+
+    def __init__(self):
+        super().__init__(models.F("id"))
+
+    def as_sqlite(self, compiler, connection, **extra):
+        # Returns a JSON array string, decoded in rows_to_dicts().
+        template = (
+            f"(SELECT json_group_array(user_id) FROM (SELECT user_id FROM {OWNERS_TABLE} "
+            f"WHERE task_id = %(expressions)s ORDER BY user_id))"
+        )
+        return self.as_sql(compiler, connection, template=template, **extra)
+
+
+def supported(qs):
+    return connections[qs.db].vendor in ("postgresql", "sqlite")
+
+
+def field_names(fields):
+    """Rendered field names in serializer order (``fields=None`` means all)."""
+    return [name for name in FIELDS if fields is None or name in fields]
+
+
+def values_queryset(qs, names, *extra_columns):
+    """``qs`` as tuples of ``names`` followed by ``extra_columns``."""
+    columns = [FOREIGN_KEYS.get(name, name) for name in names]
+    if "owners" in names:
+        qs = qs.annotate(owner_ids=OwnerIds())
+        columns[names.index("owners")] = "owner_ids"
+    return qs.values_list(*columns, *extra_columns)
+
+
+def _datetime_formatter():
+    """None when orjson can encode the datetimes as-is, else a DRF-style formatter."""
+    tz = timezone.get_current_timezone()
+    if orjson is not None and str(tz) == "UTC":
+        return None  # OPT_UTC_Z matches DRF's "...Z" output
+
+    def format_datetime(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return format_datetime
+
+
+def rows_to_dicts(rows, names):
+    """Turn ``values_queryset`` tuples into serializer-shaped dicts."""
+    data = [dict(zip(names, row)) for row in rows]
+    if "owners" in names and data and isinstance(data[0]["owners"], str):
+        loads = orjson.loads if orjson is not None else json.loads
+        for item in data:
+            item["owners"] = loads(item["owners"])
+    format_datetime = _datetime_formatter()
+    if format_datetime is not None:
+        dates = [name for name in names if name in DATETIME_FIELDS]
+        for item in data:
+            for name in dates:
+                if item[name] is not None:
+                    item[name] = format_datetime(item[name])
+    return data
+
+
+def dumps(data):
+    """Encode like DRF's JSONRenderer with default settings."""
+    if orjson is not None:
+        body = orjson.dumps(data, option=orjson.OPT_UTC_Z)
+        return body.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+    body = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    return body.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+def render(rows, names, wrap=None):
+    """Bytes for ``rows`` (``values_queryset`` tuples), optionally wrapped in an envelope."""
+    with timed("serialize"):
+        data = rows_to_dicts(rows, names)
+        return dumps(wrap(data) if wrap else data)
+
+
+class PrerenderedResponse(Response):
+    """
+    A DRF Response whose JSON body is already encoded, so the view keeps the
+    usual Response contract (headers, ``.data``) without re-rendering.
+    """
+
+    def __init__(self, encoded, **kwargs):
+        self.encoded = encoded
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+        # Decoded on demand only (tests, debugging); the body is sent as-is.
+        return json.loads(self.encoded)
+
+    @data.setter
+    def data(self, value):
+        pass  # Response.__init__ assigns None
+
+    @property
+    def rendered_content(self):
+        self["Content-Type"] = "application/json"
+        return self.encoded
@@ -0,0 +1,113 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task
+
+# Only indexed columns are sortable, so every ordering is an index scan:
+#   created_at, due_date -> their own db_index
+#   updated_at           -> (updated_at, id)
+#   priority             -> (state, priority) when filtered by state, else its db_index
+ORDERING_FIELDS = {"created_at", "due_date", "priority", "updated_at"}
+DEFAULT_ORDERING = "-created_at"
+
+TRUE_VALUES = {"1", "true", "yes"}
+
+MAX_ID = 2**63 - 1  # bigint primary keys
+
+
+def parse_id(raw, name):
+    """``raw`` as a primary key; bigger values would overflow the database column."""
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = None
+    if value is None or not 0 < value <= MAX_ID:
+        raise ValueError(f"{name} must be an id between 1 and {MAX_ID}.")
+    return value
+
+
+def parse_ordering(params):
+    ordering = params.get("ordering") or DEFAULT_ORDERING
+    if ordering.lstrip("-") not in ORDERING_FIELDS:
+        allowed = ", ".join(sorted(ORDERING_FIELDS))
+        raise ValueError(f"ordering must be one of: {allowed} (prefix '-' for descending).")
+    return ordering
+
+
+def _parse_user(raw, user, name):
+    if raw == "me":
+        return user
+    try:
+        return parse_id(raw, name)
+    except ValueError:
+        raise ValueError(f"{name} must be a user id or 'me'.") from None
+
+
+def filter_tasks(qs, params, user):
+    """
+    Apply the TaskQuerySet facets named in ``params`` (a QueryDict).
+
+        ?state=open|in_progress|done|cancelled
+        ?priority=1..4
+        ?category=<id or name>
+        ?overdue=true
+        ?due_before=<ISO datetime>
+        ?owner=<user id or 'me'>
+        ?created_by=<user id or 'me'>
+
+    Raises ValueError with a client-facing message on bad input.
+    """
+    state = params.get("state")
+    if state:
+        if state not in Task.State.values:
+            raise ValueError(f"state must be one of: {', '.join(Task.State.values)}.")
+        if state == Task.State.OPEN:
+            qs = qs.open()
+        elif state == Task.State.IN_PROGRESS:
+            qs = qs.in_progress()
+        elif state == Task.State.DONE:
+            qs = qs.done()
+        else:
+            qs = qs.filter(state=state)
+
+    priority = params.get("priority")
+    if priority:
+        try:
+            priority = int(priority)
+        except ValueError:
+            priority = None
+        if priority not in Task.Priority.values:
+            raise ValueError(f"priority must be one of: {', '.join(map(str, Task.Priority.values))}.")
+        qs = qs.with_priority(priority)
+
+    category = params.get("category")
+    if category:
+        qs = qs.with_category(parse_id(category, "category") if category.isdigit() else category)
+
+    overdue = params.get("overdue", "").lower()
+    if overdue in TRUE_VALUES:
+        qs = qs.overdue()
+    elif overdue:
+        raise ValueError("overdue only accepts true.")
+
+    due_before = params.get("due_before")
+    if due_before:
+        try:
+            dt = parse_datetime(due_before)
+        except ValueError:
+            dt = None
+        if dt is None:
+            raise ValueError("due_before must be an ISO 8601 datetime.")
+        if timezone.is_naive(dt):
+            dt = timezone.make_aware(dt)
+        qs = qs.due_by(dt)
+
+    owner = params.get("owner")
+    if owner:
+        qs = qs.owned_by(_parse_user(owner, user, "owner"))
+
+    created_by = params.get("created_by")
+    if created_by:
+        qs = qs.created_by(_parse_user(created_by, user, "created_by"))
+
+    return qs
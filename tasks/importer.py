@@ -0,0 +1,290 @@
+"""
+Bulk task import from CSV, NDJSON or a JSON array.
+
+Rows are parsed as a stream and inserted CHUNK_SIZE at a time: each chunk
+resolves category names (cached category list) and owner usernames (one
+query for names not seen yet) through in-memory maps, computes
+``is_overdue`` once per chunk, and writes tasks, owners and memberships with
+``bulk_create`` (the same helpers as ``bulk.py``). The chunk and the job's
+progress commit together, so ``run_import`` can resume a failed job without
+duplicating rows.
+
+Columns match the export: title, description, priority (value or name),
+state, due_date, category (name) and owners (usernames; a list, or
+``;``-separated in CSV). Other columns are ignored. Invalid rows are skipped
+and reported on the job instead of failing the import.
+"""
+import csv
+import hashlib
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .bulk import set_owners
+from .cache import get_categories, invalidate_users
+from .models import ImportJob, Task, TaskMembership
+
+CHUNK_SIZE = 1000
+MAX_ERRORS = 100
+READ_SIZE = 64 * 1024
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}
+
+Role = TaskMembership.Role
+
+
+class ImportFormatError(Exception):
+    """The file can't be parsed (as opposed to a single invalid row)."""
+
+
+class RowError(Exception):
+    pass
+
+
+def detect_format(filename):
+    for extension, kind in FORMATS.items():
+        if (filename or "").lower().endswith(extension):
+            return kind
+    return None
+
+
+def file_checksum(binary):
+    digest = hashlib.sha256()
+    for block in iter(lambda: binary.read(READ_SIZE), b""):
+        digest.update(block)
+    binary.seek(0)
+    return digest.hexdigest()
+
+
+def _json_array_rows(text):
+    """Elements of a top-level JSON array, decoded incrementally."""
+    decoder = json.JSONDecoder()
+    buffer, pos, started = "", 0, False
+    while True:
+        block = text.read(READ_SIZE)
+        buffer, pos = buffer[pos:] + block, 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ImportFormatError("Expected a JSON array of tasks.")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not block:
+                    raise ImportFormatError("Invalid JSON.") from None
+                break  # element continues in the next block
+            yield item
+        if not block:
+            raise ImportFormatError("Unterminated JSON array.")
+
+
+def _ndjson_rows(text):
+    for number, line in enumerate(text, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                raise ImportFormatError(f"Line {number} is not valid JSON.") from None
+
+
+def parse_rows(binary, input_format):
+    """Yield raw rows (dicts) from a binary file object."""
+    text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    try:
+        if input_format == "csv":
+            yield from csv.DictReader(text)
+        elif input_format == "ndjson":
+            yield from _ndjson_rows(text)
+        else:
+            yield from _json_array_rows(text)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFormatError(str(exc)) from None
+    finally:
+        text.detach()
+
+
+def _owner_names(raw):
+    owners = raw.get("owners") or []
+    if isinstance(owners, str):
+        owners = owners.split(";")
+    if not isinstance(owners, list):
+        raise RowError("owners must be a list of usernames.")
+    return [str(name).strip() for name in owners if str(name).strip()]
+
+
+def _clean(raw, categories, user_ids):
+    """Task field values for one row; RowError if the row is invalid."""
+    if not isinstance(raw, dict):
+        raise RowError("Row must be an object.")
+    title = str(raw.get("title") or "").strip()
+    if not title:
+        raise RowError("title is required.")
+    if len(title) > Task._meta.get_field("title").max_length:
+        raise RowError("title is too long.")
+
+    priority = raw.get("priority") or Task.Priority.MEDIUM
+    if isinstance(priority, str) and not priority.isdigit():
+        priority = Task.Priority.__members__.get(priority.upper(), priority)
+    try:
+        priority = Task.Priority(int(priority))
+    except (TypeError, ValueError):
+        raise RowError(f"Unknown priority {raw.get('priority')!r}.") from None
+
+    state = raw.get("state") or Task.State.OPEN
+    if state not in Task.State.values:
+        raise RowError(f"Unknown state {state!r}.")
+
+    due_date = raw.get("due_date") or None
+    if due_date is not None:
+        try:
+            due_date = parse_datetime(str(due_date))
+        except ValueError:
+            due_date = None
+        if due_date is None:
+            raise RowError(f"Invalid due_date {raw.get('due_date')!r}.")
+        if timezone.is_naive(due_date):
+            due_date = timezone.make_aware(due_date)
+
+    category_id = None
+    if raw.get("category"):
+        category_id = categories.get(str(raw["category"]).casefold())
+        if category_id is None:
+            raise RowError(f"Unknown category {raw['category']!r}.")
+
+    owners = []
+    for name in _owner_names(raw):
+        if user_ids.get(name) is None:
+            raise RowError(f"Unknown owner {name!r}.")
+        owners.append(user_ids[name])
+
+    fields = {
+        "title": title,
+        "description": str(raw.get("description") or ""),
+        "priority": priority,
+        "state": state,
+        "due_date": due_date,
+        "category_id": category_id,
+    }
+    return fields, owners
+
+
+class Importer:
+    def __init__(self, job, chunk_size=None, progress=None):
+        self.job = job
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self.progress = progress
+        self.categories = {c["name"].casefold(): c["id"] for c in get_categories()}
+        self.user_ids = {}
+
+    def _resolve_usernames(self, rows):
+        names = set()
+        for raw in rows:
+            try:
+                names.update(_owner_names(raw) if isinstance(raw, dict) else ())
+            except RowError:
+                pass
+        missing = names.difference(self.user_ids)
+        if missing:
+            found = dict(
+                get_user_model().objects.filter(username__in=missing).values_list("username", "pk")
+            )
+            self.user_ids.update({name: found.get(name) for name in missing})
+
+    def import_chunk(self, rows):
+        job, creator = self.job, self.job.user_id
+        self._resolve_usernames(rows)
+        now = timezone.now()
+        tasks, owner_ids, errors = [], [], []
+        for offset, raw in enumerate(rows):
+            try:
+                fields, owners = _clean(raw, self.categories, self.user_ids)
+            except RowError as exc:
+                errors.append({"row": job.rows_done + offset + 1, "error": str(exc)})
+                continue
+            task = Task(created_by_id=creator, **fields)
+            task.sync_overdue(now)
+            tasks.append(task)
+            owner_ids.append(owners or [creator])
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            TaskMembership.objects.bulk_create(
+                [TaskMembership(task=t, user_id=creator, role=Role.CREATOR) for t in tasks]
+            )
+            set_owners({t.pk: ids for t, ids in zip(tasks, owner_ids)})
+            invalidate_users({creator}.union(*owner_ids))
+
+            job.rows_done += len(rows)
+            job.created_count += len(tasks)
+            job.skipped_count += len(errors)
+            job.errors = (job.errors + errors)[:MAX_ERRORS]
+            job.save(update_fields=[
+                "rows_done", "created_count", "skipped_count", "errors", "updated_at",
+            ])
+        if self.progress:
+            self.progress(job)
+
+    def run(self, rows):
+        """Import ``rows`` (all of them, including ones already done)."""
+        skip = self.job.rows_done
+        chunk = []
+        for index, raw in enumerate(rows):
+            if index < skip:
+                continue
+            chunk.append(raw)
+            if len(chunk) == self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+
+
+def prepare_job(user, binary, input_format, source="", job=None):
+    """
+    A new ImportJob for ``binary``, or ``job`` ready to resume; the file must
+    be the one the job started with (ImportFormatError otherwise).
+    """
+    checksum = file_checksum(binary)
+    if job is None:
+        return ImportJob.objects.create(
+            user=user, source=source[:255], input_format=input_format, checksum=checksum
+        )
+    if job.checksum != checksum or job.input_format != input_format:
+        raise ImportFormatError("The file differs from the one this import started with.")
+    if job.status != ImportJob.Status.DONE:
+        job.status = ImportJob.Status.RUNNING
+        job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def run_import(job, binary, chunk_size=None, progress=None):
+    """
+    Import the rows of ``binary`` not yet done by ``job``. If the import
+    stops part-way the job is marked ``failed`` and the exception re-raised;
+    committed chunks stay, and running it again picks up after them.
+    """
+    if job.status == ImportJob.Status.DONE:
+        return job
+    try:
+        Importer(job, chunk_size, progress).run(parse_rows(binary, job.input_format))
+    except Exception as exc:
+        job.refresh_from_db()  # drop progress from the chunk that rolled back
+        job.status = ImportJob.Status.FAILED
+        job.errors = (job.errors + [{"row": job.rows_done + 1, "error": str(exc)}])[:MAX_ERRORS]
+        job.save(update_fields=["status", "errors", "updated_at"])
+        raise
+    job.status = ImportJob.Status.DONE
+    job.save(update_fields=["status", "updated_at"])
+    return job
@@ -0,0 +1,76 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from tasks import fastjson
+from tasks.factories import seed
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+
+
+def _best_and_median(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, min(samples), statistics.median(samples)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering a task list through TaskSerializer + JSONRenderer "
+        "with the values()/orjson fast path, on a throwaway test database. "
+        "Fails if the two outputs differ by a single byte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=2000)
+        parser.add_argument("--max-owners", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, tasks, max_owners, repeat, **options):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seed(users=10, tasks_per_user=max(1, tasks // 10), max_owners=max_owners)
+            qs = Task.objects.order_by("-created_at", "-id")
+            names = fastjson.field_names(None)
+
+            def slow():
+                rows = list(qs.with_relations())
+                return JSONRenderer().render(TaskSerializer(rows, many=True).data)
+
+            def fast():
+                return fastjson.render(list(fastjson.values_queryset(qs, names)), names)
+
+            def slow_render_only(rows=list(qs.with_relations())):
+                return JSONRenderer().render(TaskSerializer(rows, many=True).data)
+
+            def fast_render_only(rows=list(fastjson.values_queryset(qs, names))):
+                return fastjson.render(rows, names)
+
+            results = {
+                "serializer (query + render)": _best_and_median(slow, repeat),
+                "fast path (query + render)": _best_and_median(fast, repeat),
+                "serializer (render only)": _best_and_median(slow_render_only, repeat),
+                "fast path (render only)": _best_and_median(fast_render_only, repeat),
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        bodies = {body for body, _, _ in results.values()}
+        if len(bodies) != 1:
+            raise CommandError("Fast path output differs from the serializer output.")
+
+        encoder = "orjson" if fastjson.orjson is not None else "json (stdlib)"
+        self.stdout.write(f"tasks: {tasks}, body: {len(bodies.pop())} bytes, encoder: {encoder}")
+        for label, (_, best, median) in results.items():
+            self.stdout.write(f"{label:<28} best={best:8.2f}ms median={median:8.2f}ms")
+        for kind in ("query + render", "render only"):
+            slow_ms = results[f"serializer ({kind})"][2]
+            fast_ms = results[f"fast path ({kind})"][2]
+            self.stdout.write(f"speedup ({kind}): {slow_ms / fast_ms:.1f}x")
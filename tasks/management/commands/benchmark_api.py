@@ -0,0 +1,264 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from itertools import count
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.tokens import RefreshToken
+from tasks.factories import seed
+from tasks.models import Task
+
+PASSWORD = "bench-pass-123"
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def scenarios(user, task):
+    """
+    ``(name, expected_status, prepare)`` for every API route. ``prepare(i)``
+    returns ``(method, path, payload)`` and runs outside the timed section.
+    Method "upload" posts ``payload`` as multipart form data.
+    """
+    serial = count()
+    list_url = reverse("task_list")
+    detail_url = reverse("task_detail", args=[task.pk])
+    due = (timezone.now() + timezone.timedelta(days=3)).isoformat()
+
+    def fixed(method, path, payload=None):
+        return lambda i: (method, path, payload)
+
+    def logout(i):
+        return "post", reverse("user_logout"), {"refresh": str(RefreshToken.for_user(user))}
+
+    def refresh(i):
+        return "post", reverse("token_refresh"), {"refresh": str(RefreshToken.for_user(user))}
+
+    def register(i):
+        name = f"bench-new-{next(serial)}-{time.time_ns()}"
+        return "post", reverse("user_register"), {
+            "username": name, "password": PASSWORD, "password2": PASSWORD
+        }
+
+    def bulk(i):
+        creates = [{"title": f"Bulk {i}-{n}", "due_date": due} for n in range(20)]
+        return "post", reverse("task_bulk"), {"create": creates}
+
+    import_rows = "".join(f"Imported {n},2,open,{due},,\n" for n in range(100))
+    import_body = f"title,priority,state,due_date,category,owners\n{import_rows}".encode()
+
+    def upload(i):
+        return "upload", reverse("task_import"), {"file": SimpleUploadedFile("tasks.csv", import_body)}
+
+    def delete(i):
+        doomed = Task.objects.create(title=f"Doomed {i}", created_by=user)
+        return "delete", reverse("task_detail", args=[doomed.pk]), None
+
+    return [
+        ("tasks.list", 200, fixed("get", list_url)),
+        ("tasks.list.page", 200, fixed("get", f"{list_url}?limit=50")),
+        ("tasks.list.filtered", 200, fixed("get", f"{list_url}?state=open&ordering=due_date&limit=50")),
+        ("tasks.list.fields", 200, fixed("get", f"{list_url}?fields=id,title,state&limit=50")),
+        ("tasks.create", 201, fixed("post", list_url, {"title": "Bench", "due_date": due})),
+        ("tasks.detail", 200, fixed("get", detail_url)),
+        ("tasks.update", 200, fixed("patch", detail_url, {"state": Task.State.IN_PROGRESS})),
+        ("tasks.delete", 204, delete),
+        ("tasks.bulk", 200, bulk),
+        ("tasks.import", 201, upload),
+        ("tasks.search", 200, fixed("get", f"{reverse('task_search')}?q=rep&limit=20")),
+        ("tasks.categories", 200, fixed("get", reverse("category_list"))),
+        ("tasks.export", 200, fixed("get", f"{reverse('task_export')}?output=ndjson")),
+        ("tasks.export.csv", 200, fixed("get", f"{reverse('task_export')}?output=csv&state=open")),
+        ("tasks.summary", 200, fixed("get", reverse("task_summary"))),
+        ("tasks.changes", 200, fixed("get", f"{reverse('task_changes')}?limit=200")),
+        ("user.me", 200, fixed("get", reverse("user_me"))),
+        ("user.login", 200, fixed("post", reverse("user_login"), {"username": user.username, "password": PASSWORD})),
+        ("user.refresh", 200, refresh),
+        ("user.register", 201, register),
+        ("user.logout", 205, logout),
+    ]
+
+
+def run_suite(user, task, runs=20, warmup=2, only=None, reconnect=False):
+    """
+    Run every scenario ``warmup + runs`` times; returns ``{name: stats}``.
+    With ``reconnect`` the connection is closed before each request, so the
+    timing includes connection setup (or a pool checkout with DATABASE_POOL).
+    """
+    access = str(RefreshToken.for_user(user).access_token)
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {access}")
+    results = {}
+    # Measure the endpoints, not the per-client rate limits.
+    with override_settings(THROTTLING_ENABLED=False):
+        for name, expected, prepare in scenarios(user, task):
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            latencies, queries, errors = [], [], 0
+            for i in range(warmup + runs):
+                method, path, payload = prepare(i)
+                with CaptureQueriesContext(connection) as ctx:
+                    if reconnect:
+                        connection.close()
+                    started = time.perf_counter()
+                    if method == "get":
+                        response = client.get(path)
+                    elif method == "upload":
+                        response = client.post(path, payload)
+                    else:
+                        response = getattr(client, method)(path, payload, content_type="application/json")
+                    if response.streaming:  # time the whole export, not just the headers
+                        b"".join(response.streaming_content)
+                    elapsed = time.perf_counter() - started
+                if i < warmup:
+                    continue
+                errors += response.status_code != expected
+                latencies.append(elapsed * 1000)
+                queries.append(len(ctx.captured_queries))
+            results[name] = {
+                "runs": runs,
+                "errors": errors,
+                "p50_ms": round(statistics.median(latencies), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+                "p99_ms": round(_percentile(latencies, 99), 3),
+                "mean_ms": round(statistics.fmean(latencies), 3),
+                "queries": max(queries),
+            }
+    return results
+
+
+def compare(baseline, current, threshold):
+    """Rows of ``(name, metric, before, after, regressed)`` for shared scenarios."""
+    rows = []
+    for name, after in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "queries"):
+            old, new = before[metric], after[metric]
+            if metric == "queries":
+                regressed = new > old
+            else:
+                regressed = old > 0 and (new - old) / old * 100 > threshold
+            rows.append((name, metric, old, new, regressed))
+    return rows
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and measure latency percentiles and "
+        "query counts for every API endpoint. Write results with --output and "
+        "diff two runs with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--tasks-per-user", type=int, default=200)
+        parser.add_argument("--max-owners", type=int, default=3)
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--only", nargs="+", help="Scenario name prefixes, e.g. tasks.list user.login"
+        )
+        parser.add_argument(
+            "--connections",
+            choices=["persistent", "new"],
+            default="persistent",
+            help="'new' closes the database connection before every request, so "
+            "latencies include connecting (or pool checkout with DATABASE_POOL=psycopg). "
+            "Has no effect on SQLite's in-memory test database.",
+        )
+        parser.add_argument("--output", help="Write results JSON to this file.")
+        parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="Latency increase (percent) that counts as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                baseline = json.load(fh)["results"]
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            cache.clear()
+            users, _, task_count = seed(
+                users=options["users"],
+                tasks_per_user=options["tasks_per_user"],
+                max_owners=options["max_owners"],
+                seed=options["seed"],
+                password=PASSWORD,
+            )
+            user = users[0]
+            task = Task.objects.filter(created_by=user).first()
+            results = run_suite(
+                user, task, options["runs"], options["warmup"], options["only"],
+                reconnect=options["connections"] == "new",
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            "meta": {
+                "revision": _git_revision(),
+                "timestamp": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "cache": settings.CACHES["default"]["BACKEND"],
+                "connections": options["connections"],
+                "database_pool": settings.DATABASE_POOL or None,
+                "users": options["users"],
+                "tasks": task_count,
+                "max_owners": options["max_owners"],
+            },
+            "results": results,
+        }
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<22} p50={stats['p50_ms']:8.2f}ms p95={stats['p95_ms']:8.2f}ms "
+                f"p99={stats['p99_ms']:8.2f}ms queries={stats['queries']:3} errors={stats['errors']}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            rows = compare(baseline, results, options["threshold"])
+            for name, metric, old, new, regressed in rows:
+                if regressed:
+                    self.stdout.write(f"REGRESSION {name} {metric}: {old} -> {new}")
+            if any(row[-1] for row in rows):
+                raise CommandError("Performance regressed against the baseline.")
+            self.stdout.write("No regressions against the baseline.")
+        if any(stats["errors"] for stats in results.values()):
+            raise CommandError("Some requests returned an unexpected status.")
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import importer
+from tasks.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from a CSV, NDJSON or JSON-array file in chunked, "
+        "set-based inserts. Re-run with --resume JOB_ID after a failure to "
+        "continue from the last committed chunk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--user", required=True, help="Username the tasks are created by.")
+        parser.add_argument("--input", choices=["csv", "ndjson", "json"])
+        parser.add_argument("--chunk-size", type=int, default=importer.CHUNK_SIZE)
+        parser.add_argument("--resume", type=int, metavar="JOB_ID")
+
+    def handle(self, *args, path, user, input, chunk_size, resume, **options):
+        try:
+            user = get_user_model().objects.get(username=user)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named {user!r}.")
+        input_format = input or importer.detect_format(path)
+        if input_format is None:
+            raise CommandError("Can't tell the format from the file name; pass --input.")
+        job = None
+        if resume:
+            job = ImportJob.objects.filter(pk=resume, user=user).first()
+            if job is None:
+                raise CommandError(f"No import #{resume} for {user.username}.")
+
+        def progress(job):
+            self.stdout.write(
+                f"import #{job.pk}: {job.rows_done} rows, "
+                f"{job.created_count} created, {job.skipped_count} skipped"
+            )
+
+        with open(path, "rb") as binary:
+            try:
+                job = importer.prepare_job(user, binary, input_format, path, job)
+                importer.run_import(job, binary, chunk_size, progress)
+            except importer.ImportFormatError as exc:
+                raise CommandError(str(exc))
+            except Exception:
+                if job is not None:
+                    self.stderr.write(f"Import #{job.pk} failed; resume with --resume {job.pk}")
+                raise
+
+        for error in job.errors:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        self.stdout.write(
+            f"Import #{job.pk} {job.status}: {job.created_count} created, "
+            f"{job.skipped_count} skipped"
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _get(url, headers, read_delay):
+    """One keep-alive-less HTTP/1.1 GET; returns (status, seconds)."""
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=parts.scheme == "https"
+    )
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    # A slow client trickles the body in, holding the server's connection open.
+    while await reader.read(1024 if read_delay else 65536):
+        if read_delay:
+            await asyncio.sleep(read_delay)
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GETs to a running server and report throughput and "
+        "latency percentiles. Run it against the WSGI and ASGI profiles "
+        "(SERVER_MODE) with the same arguments to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="e.g. http://127.0.0.1:8000/api/tasks/")
+        parser.add_argument("--token", help="Access token sent as a Bearer header.")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=0,
+            help="Extra connections that read responses 1KB at a time.",
+        )
+        parser.add_argument("--read-delay", type=float, default=0.05)
+
+    def handle(self, *args, url, token, requests, concurrency, slow_clients, read_delay, **options):
+        if urlsplit(url).scheme not in ("http", "https"):
+            raise CommandError("url must be http:// or https://")
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        results, wall = asyncio.run(
+            self._run(url, headers, requests, concurrency, slow_clients, read_delay)
+        )
+
+        latencies = [elapsed * 1000 for status, elapsed in results if status == 200]
+        failures = len(results) - len(latencies)
+        if not latencies:
+            raise CommandError(f"All {len(results)} requests failed")
+        self.stdout.write(
+            f"requests={len(results)} concurrency={concurrency} slow_clients={slow_clients} "
+            f"throughput={len(latencies) / wall:.1f} req/s "
+            f"p50={statistics.median(latencies):.1f}ms "
+            f"p95={_percentile(latencies, 95):.1f}ms "
+            f"p99={_percentile(latencies, 99):.1f}ms "
+            f"failures={failures}"
+        )
+
+    async def _run(self, url, headers, requests, concurrency, slow_clients, read_delay):
+        pending = iter(range(requests))
+        results = []
+
+        async def worker():
+            for _ in pending:
+                try:
+                    results.append(await _get(url, headers, 0))
+                except (OSError, ValueError, IndexError):
+                    results.append((0, 0))
+
+        async def slow_worker():
+            while True:
+                try:
+                    await _get(url, headers, read_delay)
+                except (OSError, ValueError, IndexError):
+                    await asyncio.sleep(read_delay)
+
+        slow = [asyncio.create_task(slow_worker()) for _ in range(slow_clients)]
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+        for task in slow:
+            task.cancel()
+        await asyncio.gather(*slow, return_exceptions=True)
+        return results, wall
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from tasks.cache import invalidate_tasks
+from tasks.models import Task
+
+
+def _update_in_batches(qs, batch_size, **values):
+    touched = 0
+    while True:
+        # Rows leave ``qs`` once updated, so always take the first batch. Any
+        # batch will do: unordered, it comes straight off the partial index.
+        with transaction.atomic():
+            ids = list(qs.order_by().values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return touched
+            touched += Task.objects.filter(pk__in=ids).update(**values)
+            # Bumps versions on commit, so no reader can cache the old rows
+            # under the new version.
+            invalidate_tasks(ids)
+
+
+def sweep(batch_size=1000, now=None):
+    """
+    Bring ``is_overdue`` in line with due_date/state for rows nobody has
+    saved since their due date passed. Returns ``(marked, cleared)``.
+    """
+    now = now or timezone.now()
+    stale = Task.objects.past_due(now).filter(is_overdue=False)
+    expired = Task.objects.filter(is_overdue=True).filter(
+        Q(state=Task.State.DONE) | Q(due_date__gte=now)
+    )
+    marked = _update_in_batches(stale, batch_size, is_overdue=True, updated_at=now)
+    cleared = _update_in_batches(expired, batch_size, is_overdue=False, updated_at=now)
+    return marked, cleared
+
+
+class Command(BaseCommand):
+    help = "Flip Task.is_overdue for tasks whose due date has passed, in set-based batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running, sweeping every N seconds (0 = run once).",
+        )
+
+    def handle(self, *args, batch_size, interval, **options):
+        while True:
+            started = time.monotonic()
+            marked, cleared = sweep(batch_size=batch_size)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"Marked {marked} overdue, cleared {cleared} in {elapsed:.3f}s"
+            )
+            if not interval:
+                return
+            time.sleep(interval)
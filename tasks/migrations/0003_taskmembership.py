@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_memberships(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskMembership = apps.get_model("tasks", "TaskMembership")
+    db = schema_editor.connection.alias
+
+    rows = [
+        TaskMembership(user_id=user_id, task_id=task_id, role="creator")
+        for task_id, user_id in Task.objects.using(db).values_list("id", "created_by_id").iterator()
+    ]
+    rows += [
+        TaskMembership(user_id=user_id, task_id=task_id, role="owner")
+        for task_id, user_id in Task.owners.through.objects.using(db)
+        .values_list("task_id", "user_id")
+        .iterator()
+    ]
+    TaskMembership.objects.using(db).bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_alter_category_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('creator', 'Creator'), ('owner', 'Owner')], max_length=16)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='tasks.task')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'task', 'role'), name='tasks_membership_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+    ]
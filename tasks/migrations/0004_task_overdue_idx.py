@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_taskmembership'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_overdue', True)), fields=['is_overdue'], name='tasks_task_overdue_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from tasks import search
+
+
+def create_search_index(apps, schema_editor):
+    search.ensure_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0005_task_sync"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
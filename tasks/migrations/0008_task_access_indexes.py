@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_importjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # New indexes first, so creator lookups are never left without one.
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_by', '-created_at'], name='tasks_task_creator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('state', 'done'), _negated=True), fields=['due_date'], name='tasks_task_due_open_idx'),
+        ),
+        # The auto-created owners table only indexes task_id and user_id
+        # separately; owned_by() wants user_id first with task_id alongside.
+        migrations.RunSQL(
+            'CREATE INDEX tasks_task_owners_user_task_idx ON tasks_task_owners (user_id, task_id)',
+            'DROP INDEX tasks_task_owners_user_task_idx',
+        ),
+        # Redundant now: due_date keeps its db_index=True index, and
+        # tasks_task_creator_idx leads with created_by.
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_due_dat_bce847_idx',
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='created_by',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='created_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,5 +1,7 @@
+from datetime import timedelta
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -30,14 +32,16 @@ class TaskQuerySet(models.QuerySet):
 
     # Time-based
     def overdue(self):
-        now = timezone.now()
-        return self.exclude(state=Task.State.DONE).filter(
-            models.Q(is_overdue=True) | models.Q(due_date__lt=now)
-        )
+        # Kept fresh by save()/sync_overdue() and the sweep_overdue command.
+        return self.filter(is_overdue=True)
 
     def due_by(self, dt):
         return self.filter(due_date__lte=dt)
 
+    def past_due(self, now):
+        """Not-done tasks whose due date has passed, whatever ``is_overdue`` says."""
+        return self.filter(due_date__lt=now).exclude(state=Task.State.DONE)
+
     # Faceted filters
     def with_priority(self, priority):
         return self.filter(priority=priority)
@@ -47,7 +51,10 @@ class TaskQuerySet(models.QuerySet):
             return self.filter(category=category)
         if isinstance(category, int):
             return self.filter(category_id=category)
-        return self.filter(category__name__iexact=str(category))
+        # Resolve the name from the cached category list instead of joining.
+        from .cache import category_ids_named
+
+        return self.filter(category_id__in=category_ids_named(str(category)))
 
     def owned_by(self, user):
         return self.filter(owners=user)
@@ -55,6 +62,50 @@ class TaskQuerySet(models.QuerySet):
     def created_by(self, user):
         return self.filter(created_by=user)
 
+    # Visibility
+    def visible_to(self, user):
+        """Tasks the user created or owns, via the TaskMembership index."""
+        task_ids = TaskMembership.objects.filter(user=user).values("task_id")
+        return self.filter(pk__in=task_ids)
+
+    # Aggregates
+    def summary(self, now):
+        """
+        Dashboard counts in one GROUP BY (state, priority) query:
+        totals by state and priority, overdue, and not-done tasks due in the next 7 days.
+        """
+        due_soon = models.Q(due_date__gte=now, due_date__lt=now + timedelta(days=7)) & ~models.Q(
+            state=Task.State.DONE
+        )
+        rows = self.order_by().values("state", "priority").annotate(
+            count=models.Count("id"),
+            overdue=models.Count("id", filter=models.Q(is_overdue=True)),
+            due_this_week=models.Count("id", filter=due_soon),
+        )
+        summary = {
+            "total": 0,
+            "by_state": dict.fromkeys(Task.State.values, 0),
+            "by_priority": dict.fromkeys(map(str, Task.Priority.values), 0),
+            "overdue": 0,
+            "due_this_week": 0,
+        }
+        for row in rows:
+            summary["total"] += row["count"]
+            summary["by_state"][row["state"]] += row["count"]
+            summary["by_priority"][str(row["priority"])] += row["count"]
+            summary["overdue"] += row["overdue"]
+            summary["due_this_week"] += row["due_this_week"]
+        return summary
+
+    # Loading
+    def with_owners(self):
+        """Prefetch owner ids for the whole queryset in one query."""
+        owners = get_user_model().objects.only("id").order_by("id")
+        return self.prefetch_related(models.Prefetch("owners", queryset=owners))
+
+    def with_relations(self):
+        return self.select_related("category").with_owners()
+
 
 class Task(models.Model):
     class Priority(models.IntegerChoices):
@@ -73,10 +124,12 @@ class Task(models.Model):
     description = models.TextField(blank=True)
 
     # Ownership
+    # The (created_by, -created_at) index below leads with created_by, so no separate FK index.
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="created_tasks",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     owners = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
@@ -114,7 +167,19 @@ class Task(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["state", "priority"]),
-            models.Index(fields=["due_date"]),
+            models.Index(fields=["created_by", "-created_at"], name="tasks_task_creator_idx"),
+            # past_due() and the due-soon counts only look at tasks that aren't done.
+            models.Index(
+                fields=["due_date"],
+                condition=~models.Q(state="done"),
+                name="tasks_task_due_open_idx",
+            ),
+            models.Index(fields=["updated_at", "id"], name="tasks_task_updated_idx"),
+            models.Index(
+                fields=["is_overdue"],
+                condition=models.Q(is_overdue=True),
+                name="tasks_task_overdue_idx",
+            ),
         ]
 
     def __str__(self):
@@ -130,9 +195,102 @@ class Task(models.Model):
         if self.due_date and self.created_at and self.due_date < self.created_at:
             raise ValidationError({"due_date": "Due date cannot be before creation time."})
 
-    def save(self, *args, **kwargs):
+    def sync_overdue(self, now=None):
+        """
+        Refresh ``is_overdue`` from state/due_date. Called by save(); bulk
+        writers that bypass save() must call it themselves.
+        """
         if self.state == self.State.DONE:
             self.is_overdue = False
         elif self.due_date:
-            self.is_overdue = self.due_date < timezone.now()
+            self.is_overdue = self.due_date < (now or timezone.now())
+
+    def save(self, *args, **kwargs):
+        self.sync_overdue()
         super().save(*args, **kwargs)
+
+
+class TaskMembership(models.Model):
+    """
+    Denormalized (user, task) visibility index, kept in sync with
+    ``Task.created_by`` and ``Task.owners`` by the handlers in ``signals.py``.
+    """
+
+    class Role(models.TextChoices):
+        CREATOR = "creator", "Creator"
+        OWNER = "owner", "Owner"
+
+    # The unique constraint below leads with user, so no separate FK index.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="task_memberships",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    task = models.ForeignKey(Task, related_name="memberships", on_delete=models.CASCADE)
+    role = models.CharField(max_length=16, choices=Role.choices)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "task", "role"], name="tasks_membership_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.role} #{self.task_id}"
+
+
+class TaskTombstone(models.Model):
+    """
+    Records that a task stopped being visible to a user (deleted, or the user
+    lost their membership) so incremental sync can tell clients to drop it.
+    Written by the TaskMembership post_delete handler in ``signals.py``, and
+    when a task's creator changes.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="task_tombstones",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "id"], name="tasks_tombstone_user_idx")]
+
+    def __str__(self):
+        return f"#{self.task_id} gone for {self.user_id}"
+
+
+class ImportJob(models.Model):
+    """
+    Progress of a bulk import (see ``importer.py``). ``rows_done`` advances
+    in the same transaction as each inserted chunk, so a failed import can
+    be resumed from the last committed row by re-running it with the same
+    file (checked against ``checksum``).
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+        DONE = "done", "Done"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name="import_jobs", on_delete=models.CASCADE
+    )
+    source = models.CharField(max_length=255, blank=True)
+    input_format = models.CharField(max_length=8)
+    checksum = models.CharField(max_length=64)
+    status = models.CharField(max_length=8, choices=Status.choices, default=Status.RUNNING)
+    rows_done = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Import #{self.pk} ({self.status}, {self.rows_done} rows)"
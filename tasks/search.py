@@ -0,0 +1,147 @@
+"""
+Ranked, prefix-matching full-text search over task title and description.
+
+- PostgreSQL: a GIN expression index on a weighted tsvector (title 'A',
+  description 'B'). Queries use the identical expression, so the planner can
+  use the index; ranking is ``ts_rank``.
+- SQLite: an external-content FTS5 table (``tasks_task_fts``) kept in sync by
+  triggers on tasks_task, so bulk_create/update()/delete() are covered too.
+  Ranking is ``bm25`` with title weighted above description.
+- Anything else (or SQLite without FTS5): unranked ``icontains``.
+
+``ensure_index`` is idempotent. It runs from the migration and again on
+every ``post_migrate``, because SQLite table rebuilds (AlterField and
+friends) drop the triggers.
+"""
+import re
+import sqlite3
+from functools import cache
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 8
+
+PG_INDEX = "tasks_task_search_idx"
+PG_VECTOR = (
+    "setweight(to_tsvector('english', coalesce({table}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({table}description, '')), 'B')"
+)
+
+FTS_TABLE = "tasks_task_fts"
+FTS_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='tasks_task', content_rowid='id', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+]
+FTS_TRIGGERS = [f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"]
+
+
+@cache
+def _sqlite_has_fts5():
+    options = sqlite3.connect(":memory:").execute("PRAGMA compile_options").fetchall()
+    return ("ENABLE_FTS5",) in options
+
+
+def backend(connection):
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite" and _sqlite_has_fts5():
+        return "sqlite"
+    return None
+
+
+def ensure_index(connection):
+    """Create the search index (and on SQLite its triggers) if missing."""
+    kind = backend(connection)
+    with connection.cursor() as cursor:
+        if kind == "postgresql":
+            # CONCURRENTLY keeps tasks_task writable while a large table is indexed.
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {PG_INDEX} ON tasks_task "
+                f"USING gin (({PG_VECTOR.format(table='')}))"
+            )
+        elif kind == "sqlite":
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                FTS_TRIGGERS,
+            )
+            if cursor.fetchone()[0] == len(FTS_TRIGGERS):
+                return
+            for statement in FTS_SCHEMA:
+                cursor.execute(statement)
+            # Writes made while triggers were missing are not indexed; rebuild from tasks_task.
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_index(connection):
+    kind = backend(connection)
+    with connection.cursor() as cursor:
+        if kind == "postgresql":
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {PG_INDEX}")
+        elif kind == "sqlite":
+            for trigger in FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def parse_terms(query):
+    """Words in ``query`` (lowercased, punctuation dropped); ValueError if none."""
+    terms = re.findall(r"\w+", (query or "").lower())[:MAX_TERMS]
+    if not terms:
+        raise ValueError("q must contain at least one word.")
+    return terms
+
+
+def search_tasks(qs, query, connection=None):
+    """
+    Restrict ``qs`` to tasks matching every word of ``query`` and order them
+    by relevance, best first. Words match as prefixes, so partial input
+    ("depl") finds "deploy".
+    """
+    terms = parse_terms(query)
+    kind = backend(connection or connections[qs.db])
+
+    if kind == "postgresql":
+        tsquery = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms), search_type="raw", config="english"
+        )
+        vector = RawSQL(PG_VECTOR.format(table='"tasks_task".'), (), output_field=SearchVectorField())
+        return (
+            qs.alias(search_vector=vector)
+            .filter(search_vector=tsquery)
+            .annotate(rank=SearchRank(F("search_vector"), tsquery))
+            .order_by("-rank", "-id")
+        )
+
+    if kind == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        # bm25() is lower-is-better; title hits weigh 10x description hits.
+        rank = RawSQL(
+            f"SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "tasks_task"."id"',
+            (match,),
+        )
+        return qs.filter(pk__in=matches).annotate(rank=rank).order_by("rank", "-id")
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description__icontains=term)
+    return qs.filter(condition).order_by("-id")
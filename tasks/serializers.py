@@ -1,8 +1,19 @@
 # app_name/serializers.py
 from rest_framework import serializers
-from .models import Task
+from tasktrackerAPI.metrics import TimedListSerializer, TimedSerializerMixin
+from .models import ImportJob, Task
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Pass ``fields=[...]`` to render a sparse subset of the declared fields.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
-class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = [
@@ -13,3 +24,15 @@ class TaskSerializer(serializers.ModelSerializer):
             "created_at", "updated_at",
         ]
         read_only_fields = ["created_by", "created_at", "updated_at"]
+        list_serializer_class = TimedListSerializer
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id", "source", "input_format", "status",
+            "rows_done", "created_count", "skipped_count", "errors",
+            "started_at", "updated_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_categories, invalidate_tasks, invalidate_users, member_ids
+from .models import Category, Task, TaskMembership, TaskTombstone
+
+Role = TaskMembership.Role
+
+
+@receiver(post_save, sender=Task)
+def sync_creator_membership(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        TaskMembership.objects.create(
+            user_id=instance.created_by_id, task=instance, role=Role.CREATOR
+        )
+        invalidate_users([instance.created_by_id])
+    else:
+        # Collect members first: a changed creator drops out below.
+        invalidate_users(member_ids([instance.pk]) | {instance.created_by_id})
+        moved = TaskMembership.objects.filter(task=instance, role=Role.CREATOR).exclude(
+            user_id=instance.created_by_id
+        )
+        previous = list(moved.values_list("user_id", flat=True))
+        if not previous:  # created_by didn't change
+            return
+        moved.update(user_id=instance.created_by_id)
+        # update() skips record_removed_member, so tombstone the old creator
+        # here unless they still see the task as an owner.
+        owners = set(
+            TaskMembership.objects.filter(
+                task=instance, role=Role.OWNER, user_id__in=previous
+            ).values_list("user_id", flat=True)
+        )
+        TaskTombstone.objects.bulk_create(
+            TaskTombstone(user_id=user_id, task_id=instance.pk)
+            for user_id in previous
+            if user_id not in owners
+        )
+
+
+@receiver(m2m_changed, sender=Task.owners.through)
+def sync_owner_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Mirror owner changes from either side of the relation:
+    ``task.owners.add(user)`` (forward) or ``user.owned_tasks.add(task)`` (reverse).
+    """
+    if action.startswith("pre_"):
+        # Everyone who sees the task before or after the change.
+        if reverse:
+            task_ids = pk_set if pk_set is not None else instance.owned_tasks.values("pk")
+            invalidate_tasks(task_ids, extra_user_ids=[instance.pk])
+        else:
+            invalidate_tasks([instance.pk], extra_user_ids=pk_set or ())
+        return
+
+    # Owner changes alter the task's representation, so refresh updated_at
+    # (used for ETags) without going through save().
+    changed = pk_set if reverse else [instance.pk]
+    if changed is None:  # reverse clear: owner memberships still list the tasks
+        changed = TaskMembership.objects.filter(user=instance, role=Role.OWNER).values("task_id")
+    Task.objects.filter(pk__in=changed).update(updated_at=timezone.now())
+
+    if action == "post_add":
+        if reverse:
+            rows = [TaskMembership(user=instance, task_id=pk, role=Role.OWNER) for pk in pk_set]
+        else:
+            rows = [TaskMembership(user_id=pk, task=instance, role=Role.OWNER) for pk in pk_set]
+        TaskMembership.objects.bulk_create(rows, ignore_conflicts=True)
+        return
+
+    owned = TaskMembership.objects.filter(role=Role.OWNER)
+    owned = owned.filter(user=instance) if reverse else owned.filter(task=instance)
+    if action == "post_remove":
+        owned.filter(**{"task_id__in" if reverse else "user_id__in": pk_set}).delete()
+    elif action == "post_clear":
+        owned.delete()
+
+
+@receiver(post_delete, sender=TaskMembership)
+def record_removed_member(sender, instance, origin=None, **kwargs):
+    # Covers task deletion, which cascades through the membership rows.
+    # Tombstones for tasks still visible through another role are filtered
+    # out when read (see sync.changes_since).
+    if _deleting_user(origin, instance.user_id):
+        return  # the tombstone would reference the user row being removed
+    TaskTombstone.objects.create(user_id=instance.user_id, task_id=instance.task_id)
+    invalidate_users([instance.user_id])
+
+
+def _deleting_user(origin, user_id):
+    """Whether the delete that cascaded here was of user ``user_id``."""
+    User = get_user_model()
+    if isinstance(origin, User):
+        return origin.pk == user_id
+    if isinstance(origin, QuerySet) and issubclass(origin.model, User):
+        # Dependent rows go first, so the user rows are still there.
+        return origin.filter(pk=user_id).exists()
+    return False
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_categories()
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # SET_NULL rewrites the category of these tasks without touching
+    # updated_at, which ETags and the changes feed are built on.
+    tasks = Task.objects.filter(category=instance)
+    invalidate_tasks(tasks.values("pk"))
+    tasks.update(updated_at=timezone.now())
@@ -0,0 +1,104 @@
+"""
+Incremental sync: tasks changed since a token, plus tombstones for tasks
+that disappeared from the user's view.
+
+The token is opaque to clients and holds three positions:
+``[updated_at, task id]`` of the last change sent (keyset over the
+``(updated_at, id)`` index) and the id of the last tombstone sent.
+
+Rows are stamped when written but only become visible when their
+transaction commits, so a slow transaction (or an import chunk) can commit
+a row behind a position that was already sent. The token that ends a sync
+is therefore held back by SYNC_SAFETY_SECONDS: the next sync sends that
+span again, and clients apply changes and deletions idempotently by id.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task, TaskMembership, TaskTombstone
+from .pagination import InvalidPage, decode_cursor, encode_cursor
+
+DEFAULT_LIMIT = 200
+
+
+def _parse_token(token):
+    value = decode_cursor(token)
+    if not isinstance(value, list) or len(value) != 3:
+        raise InvalidPage("Invalid sync token.")
+    updated_at, task_id, tombstone_id = value
+    if updated_at is not None:
+        updated_at = parse_datetime(updated_at) if isinstance(updated_at, str) else None
+        if updated_at is None:
+            raise InvalidPage("Invalid sync token.")
+    if not all(isinstance(i, int) for i in (task_id, tombstone_id)):
+        raise InvalidPage("Invalid sync token.")
+    return updated_at, task_id, tombstone_id
+
+
+def changes_since(user, token=None, limit=DEFAULT_LIMIT):
+    """
+    Return ``(tasks, deleted_ids, next_token, has_more)``.
+
+    Without a token, every visible task is a change and no tombstones are
+    replayed; the returned token starts the deletion log from "now" (less
+    the safety window).
+    """
+    if token:
+        updated_at, task_id, tombstone_id = _parse_token(token)
+    else:
+        updated_at, task_id = None, 0
+        tombstone_id = (
+            TaskTombstone.objects.filter(user=user).aggregate(last=Max("id"))["last"] or 0
+        )
+
+    visible = Task.objects.visible_to(user)
+    changed = visible.order_by("updated_at", "id")
+    if updated_at is not None:
+        changed = changed.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=task_id)
+        )
+    tasks = list(changed.with_relations()[: limit + 1])
+
+    tombstones = list(
+        TaskTombstone.objects.filter(user=user, id__gt=tombstone_id)
+        .order_by("id")
+        .values_list("id", "task_id")[: limit + 1]
+    )
+    has_more = len(tasks) > limit or len(tombstones) > limit
+    tasks, tombstones = tasks[:limit], tombstones[:limit]
+
+    if tasks:
+        updated_at, task_id = tasks[-1].updated_at, tasks[-1].pk
+    if tombstones:
+        tombstone_id = tombstones[-1][0]
+        gone = {pk for _, pk in tombstones}
+        gone -= set(
+            TaskMembership.objects.filter(user=user, task_id__in=gone).values_list(
+                "task_id", flat=True
+            )
+        )
+        deleted = sorted(gone)
+    else:
+        deleted = []
+
+    if not has_more:
+        # Only the last page is held back; earlier pages must advance.
+        horizon = timezone.now() - timedelta(seconds=settings.SYNC_SAFETY_SECONDS)
+        if updated_at is not None and updated_at > horizon:
+            updated_at, task_id = horizon, 0
+        settled = (
+            TaskTombstone.objects.filter(user=user, id__lte=tombstone_id, deleted_at__lte=horizon)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        tombstone_id = settled or 0
+
+    next_token = encode_cursor(
+        [updated_at.isoformat() if updated_at else None, task_id, tombstone_id]
+    )
+    return tasks, deleted, next_token, has_more
@@ -1,14 +1,32 @@
+import json
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from tasks.cache import get_task_version
 from tasks.models import Task, Category 
 
+# HTML pages (admin, browsable API) without a collectstatic manifest.
+PLAIN_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
 
 class TaskApiTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.User = get_user_model()
         self.user = self.User.objects.create_user(
             username="testuser", password="pass1234", email="user@example.com"
@@ -118,3 +136,1030 @@ class TaskApiTests(APITestCase):
         }
         response = self.client.post(self.list_url, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    # -------------------------
+    # Pagination / sparse fields
+    # -------------------------
+    def test_list_cursor_pagination(self):
+        for i in range(5):
+            Task.objects.create(title=f"Task {i}", created_by=self.user)
+        seen = []
+        response = self.client.get(self.list_url, {"limit": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [t["title"] for t in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, [f"Task {i}" for i in reversed(range(5))])
+
+    def test_list_invalid_cursor(self):
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_sparse_fields(self):
+        Task.objects.create(title="Sparse", created_by=self.user)
+        response = self.client.get(self.list_url, {"fields": "id,title"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "title"})
+
+        response = self.client.get(self.list_url, {"fields": "id,nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # -------------------------
+    # Query counts
+    # -------------------------
+    def _count_list_queries(self, fast):
+        from tasks.fastjson import PrerenderedResponse
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(isinstance(response, PrerenderedResponse), fast)
+        self.assertEqual(len(response.data), Task.objects.count())
+        return len(ctx.captured_queries)
+
+    def _assert_constant_list_queries(self, fast):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+
+        def make_tasks(n):
+            for i in range(n):
+                task = Task.objects.create(
+                    title=f"Task {i}", created_by=self.user, category=self.category
+                )
+                task.owners.add(self.user, other)
+
+        make_tasks(2)
+        baseline = self._count_list_queries(fast)
+        make_tasks(8)
+        self.assertEqual(self._count_list_queries(fast), baseline)
+
+    @override_settings(TASK_LIST_FAST_JSON=False)
+    def test_list_query_count_is_constant(self):
+        # Serializer path: owners and category must come from prefetch/joins.
+        self._assert_constant_list_queries(fast=False)
+
+    def test_fast_list_query_count_is_constant(self):
+        # values() path: owner ids come from a subquery in the same SELECT.
+        self._assert_constant_list_queries(fast=True)
+
+    # -------------------------
+    # Visibility
+    # -------------------------
+    def test_membership_tracks_creator_and_owners(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        task = Task.objects.create(title="Shared", created_by=self.user)
+        self.assertFalse(Task.objects.visible_to(other).exists())
+
+        task.owners.add(other)
+        self.assertEqual(list(Task.objects.visible_to(other)), [task])
+
+        other.owned_tasks.remove(task)
+        self.assertFalse(Task.objects.visible_to(other).exists())
+
+        task.created_by = other
+        task.save()
+        self.assertEqual(list(Task.objects.visible_to(other)), [task])
+        self.assertFalse(Task.objects.visible_to(self.user).exists())
+
+    def test_other_users_task_not_found(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        task = Task.objects.create(title="Private", created_by=other)
+        response = self.client.get(reverse("task_detail", args=[task.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # -------------------------
+    # Filtering / ordering
+    # -------------------------
+    def test_list_filters(self):
+        now = timezone.now()
+        Task.objects.create(title="Open", created_by=self.user, category=self.category)
+        Task.objects.create(
+            title="Urgent", created_by=self.user, priority=Task.Priority.URGENT,
+            state=Task.State.IN_PROGRESS, due_date=now + timezone.timedelta(days=1),
+        )
+        Task.objects.create(title="Done", created_by=self.user, state=Task.State.DONE)
+
+        def titles(**params):
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+            return {t["title"] for t in response.data}
+
+        self.assertEqual(titles(state="done"), {"Done"})
+        self.assertEqual(titles(priority=Task.Priority.URGENT), {"Urgent"})
+        self.assertEqual(titles(category="work"), {"Open"})
+        self.assertEqual(titles(category=self.category.id), {"Open"})
+        self.assertEqual(titles(due_before=(now + timezone.timedelta(days=2)).isoformat()), {"Urgent"})
+        self.assertEqual(titles(created_by="me"), {"Open", "Urgent", "Done"})
+        Task.objects.get(title="Open").owners.add(self.user)
+        self.assertEqual(titles(owner="me"), {"Open"})
+
+        response = self.client.get(self.list_url, {"state": "bogus"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Ids past the bigint range are rejected rather than overflowing the query.
+        huge = "9" * 23
+        for params in ({"category": huge}, {"owner": huge}, {"created_by": huge}, {"owner": "0"}):
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=params)
+        self.assertEqual(titles(owner=2**63 - 1), set())
+
+    def test_list_ordering_with_pagination(self):
+        now = timezone.now()
+        for days in (3, None, 1, 2, None):
+            Task.objects.create(
+                title=f"due {days}", created_by=self.user,
+                due_date=now + timezone.timedelta(days=days) if days else None,
+            )
+        seen = []
+        response = self.client.get(self.list_url, {"ordering": "due_date", "limit": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+            seen += [t["title"] for t in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen[:3], ["due 1", "due 2", "due 3"])
+        self.assertEqual(sorted(seen[3:]), ["due None", "due None"])
+
+        response = self.client.get(self.list_url, {"ordering": "title"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # -------------------------
+    # Bulk
+    # -------------------------
+    def test_bulk_create_update_delete(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        existing = Task.objects.create(title="Existing", created_by=self.user)
+        doomed = Task.objects.create(title="Doomed", created_by=self.user)
+        past = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+        payload = {
+            "create": [
+                {"title": "Bulk 1", "due_date": past},
+                {"title": "Bulk 2", "owners": [other.id]},
+            ],
+            "update": [{"id": existing.id, "title": "Renamed", "owners": [other.id]}],
+            "delete": [doomed.id],
+        }
+        response = self.client.post(reverse("task_bulk"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([t["title"] for t in response.data["created"]], ["Bulk 1", "Bulk 2"])
+        self.assertTrue(response.data["created"][0]["is_overdue"])
+        self.assertEqual(response.data["created"][0]["owners"], [self.user.id])
+        self.assertEqual(response.data["updated"][0]["title"], "Renamed")
+        self.assertFalse(Task.objects.filter(id=doomed.id).exists())
+
+        # Membership index is maintained without save()/signals.
+        self.assertEqual(
+            set(Task.objects.visible_to(other).values_list("title", flat=True)),
+            {"Bulk 2", "Renamed"},
+        )
+
+    def test_bulk_is_atomic(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        foreign = Task.objects.create(title="Foreign", created_by=other)
+        payload = {"create": [{"title": "Never saved"}], "delete": [foreign.id]}
+        response = self.client.post(reverse("task_bulk"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["delete"], [{"id": ["Not found."]}])
+        self.assertFalse(Task.objects.filter(title="Never saved").exists())
+        self.assertTrue(Task.objects.filter(id=foreign.id).exists())
+
+    def test_bulk_rejects_non_integer_ids(self):
+        task = Task.objects.create(id=1, title="First", created_by=self.user)  # what true == 1 would match
+        url = reverse("task_bulk")
+        response = self.client.post(url, {"update": [{"id": True, "title": "Hijacked"}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["update"], [{"id": ["Not found."]}])
+        for ids in ([True], [2**63]):
+            response = self.client.post(url, {"delete": ids}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        task.refresh_from_db()
+        self.assertEqual(task.title, "First")
+
+    # -------------------------
+    # Overdue sweeper
+    # -------------------------
+    def test_sweep_overdue_command(self):
+        now = timezone.now()
+        stale = Task.objects.create(
+            title="Stale", created_by=self.user, due_date=now + timezone.timedelta(days=1)
+        )
+        done = Task.objects.create(title="Done", created_by=self.user)
+        # Simulate time passing / writes that bypassed save().
+        Task.objects.filter(pk=stale.pk).update(due_date=now - timezone.timedelta(hours=1))
+        Task.objects.filter(pk=done.pk).update(state=Task.State.DONE, is_overdue=True)
+        self.assertFalse(Task.objects.overdue().filter(pk=stale.pk).exists())
+
+        out = StringIO()
+        version = get_task_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            call_command("sweep_overdue", "--batch-size", "1", stdout=out)
+        self.assertEqual(len(callbacks), 2)  # one invalidation per committed batch
+        self.assertNotEqual(get_task_version(self.user.pk), version)
+        self.assertIn("Marked 1 overdue, cleared 1", out.getvalue())
+        self.assertEqual(list(Task.objects.overdue()), [stale])
+
+    # -------------------------
+    # Summary
+    # -------------------------
+    def test_summary_counts_and_invalidation(self):
+        now = timezone.now()
+        Task.objects.create(
+            title="Soon", created_by=self.user, priority=Task.Priority.HIGH,
+            due_date=now + timezone.timedelta(days=2),
+        )
+        Task.objects.create(title="Done", created_by=self.user, state=Task.State.DONE)
+        url = reverse("task_summary")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual(response.data["by_state"]["done"], 1)
+        self.assertEqual(response.data["by_priority"][str(Task.Priority.HIGH)], 1)
+        self.assertEqual(response.data["due_this_week"], 1)
+        self.assertEqual(response.data["overdue"], 0)
+
+        # Served from cache until one of the user's tasks changes.
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.get(title="Done").delete()
+        self.assertEqual(self.client.get(url).data["total"], 1)
+
+    # -------------------------
+    # Conditional GET
+    # -------------------------
+    def test_list_etag_not_modified(self):
+        task = Task.objects.create(title="Cached", created_by=self.user)
+        response = self.client.get(self.list_url)
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):  # the aggregate only, no serialization
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("Authorization", response["Vary"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        # A date alone can't tell that a task went away.
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_etag_changes_on_owner_change(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        task = Task.objects.create(title="Cached", created_by=self.user)
+        url = reverse("task_detail", args=[task.id])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        task.owners.add(other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    # -------------------------
+    # Incremental sync
+    # -------------------------
+    @override_settings(SYNC_SAFETY_SECONDS=0)  # consecutive syncs see only new changes
+    def test_changes_since_with_tombstones(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        keep = Task.objects.create(title="Keep", created_by=self.user)
+        doomed = Task.objects.create(title="Doomed", created_by=self.user)
+        shared = Task.objects.create(title="Shared", created_by=other)
+        shared.owners.add(self.user)
+        url = reverse("task_changes")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["changes"]), 3)
+        self.assertEqual(response.data["deleted"], [])
+        token = response.data["next"]
+
+        response = self.client.get(url, {"since": token})
+        self.assertEqual(response.data["changes"], [])
+
+        keep.title = "Kept"
+        keep.save()
+        doomed_id = doomed.id
+        doomed.delete()
+        shared.owners.remove(self.user)
+        response = self.client.get(url, {"since": token})
+        self.assertEqual([t["title"] for t in response.data["changes"]], ["Kept"])
+        self.assertEqual(response.data["deleted"], sorted([doomed_id, shared.id]))
+        self.assertFalse(response.data["has_more"])
+
+        response = self.client.get(url, {"since": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_changes_since_resends_safety_window(self):
+        from tasks.sync import changes_since
+
+        first = Task.objects.create(title="First", created_by=self.user)
+        Task.objects.create(title="Second", created_by=self.user)
+        # Paging advances past every row even inside the window...
+        tasks, _, token, has_more = changes_since(self.user, limit=1)
+        self.assertEqual(([t.title for t in tasks], has_more), (["First"], True))
+        tasks, _, token, has_more = changes_since(self.user, token, limit=1)
+        self.assertEqual(([t.title for t in tasks], has_more), (["Second"], False))
+
+        # ...but the last token is held back, so a row stamped before the
+        # newest change sent and committed after it is still delivered.
+        late = Task.objects.create(title="Late", created_by=self.user)
+        Task.objects.filter(pk=late.pk).update(updated_at=first.updated_at)
+        tasks, _, token, _ = changes_since(self.user, token)
+        self.assertIn("Late", [t.title for t in tasks])
+
+        with override_settings(SYNC_SAFETY_SECONDS=0):
+            _, _, token, _ = changes_since(self.user, token)
+            Task.objects.filter(pk=late.pk).update(updated_at=first.updated_at)
+            self.assertEqual(changes_since(self.user, token)[0], [])
+
+    def test_changes_since_tombstones_replaced_creator(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        task = Task.objects.create(title="Handed over", created_by=self.user)
+        kept = Task.objects.create(title="Still owned", created_by=self.user)
+        kept.owners.add(self.user)
+        url = reverse("task_changes")
+        token = self.client.get(url).data["next"]
+
+        for moved in (task, kept):
+            moved.created_by = other
+            moved.save()
+        response = self.client.get(url, {"since": token})
+        self.assertEqual(response.data["deleted"], [task.id])
+        self.assertEqual([t["title"] for t in response.data["changes"]], ["Still owned"])
+        self.client.force_authenticate(other)
+        self.assertEqual(len(self.client.get(url, {"since": token}).data["changes"]), 2)
+
+    def test_deleting_user_with_tasks(self):
+        from tasks.models import TaskTombstone
+
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        theirs = Task.objects.create(title="Theirs", created_by=other)
+        theirs.owners.add(self.user)
+        mine = Task.objects.create(title="Mine", created_by=self.user)
+        mine.owners.add(other, self.user)
+
+        self.user.delete()
+        self.assertFalse(Task.objects.filter(pk=mine.pk).exists())
+        self.assertEqual(list(theirs.owners.all()), [])
+        # Remaining members still hear about the deleted task.
+        self.assertEqual(list(TaskTombstone.objects.values_list("user_id", "task_id")), [(other.pk, mine.pk)])
+
+        # Bulk deletes too.
+        task = Task.objects.create(title="Also theirs", created_by=other)
+        self.User.objects.filter(pk=other.pk).delete()
+        self.assertFalse(Task.objects.filter(pk=task.pk).exists())
+
+    def test_category_delete_reaches_changes_feed(self):
+        filed = Task.objects.create(title="Filed", created_by=self.user, category=self.category)
+        url = reverse("task_changes")
+        token = self.client.get(url).data["next"]
+        etag = self.client.get(reverse("task_detail", args=[filed.pk]))["ETag"]
+
+        self.category.delete()
+        response = self.client.get(url, {"since": token})
+        self.assertEqual([(t["title"], t["category"]) for t in response.data["changes"]], [("Filed", None)])
+        response = self.client.get(reverse("task_detail", args=[filed.pk]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    # -------------------------
+    # Async (ASGI) views
+    # -------------------------
+    def test_async_views_match_sync_views(self):
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+        from accounts.tokens import RefreshToken
+        from tasks import async_views
+
+        task = Task.objects.create(title="Async", created_by=self.user, category=self.category)
+        task.owners.add(self.user)
+        expected = self.client.get(self.list_url, {"fields": "id,title,owners"})
+        factory = RequestFactory()
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+        request = factory.get(self.list_url, {"fields": "id,title,owners"}, **auth)
+        response = async_to_sync(async_views.task_list)(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+        request = factory.get(
+            self.list_url, {"fields": "id,title,owners"}, HTTP_IF_NONE_MATCH=response["ETag"], **auth
+        )
+        response = async_to_sync(async_views.task_list)(request)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        url = reverse("task_detail", args=[task.id])
+        response = async_to_sync(async_views.task_detail)(factory.get(url, **auth), pk=task.id)
+        self.assertEqual(response.content, self.client.get(url).content)
+
+        response = async_to_sync(async_views.task_list)(factory.get(self.list_url))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_list_category_filter_with_cold_cache(self):
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+        from accounts.tokens import RefreshToken
+        from tasks import async_views
+
+        Task.objects.create(title="Filed", created_by=self.user, category=self.category)
+        Task.objects.create(title="Loose", created_by=self.user)
+        cache.clear()  # category names must come from the database
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        request = RequestFactory().get(self.list_url, {"category": "work"}, **auth)
+        response = async_to_sync(async_views.task_list)(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["title"] for t in json.loads(response.content)], ["Filed"])
+
+    # -------------------------
+    # Benchmark suite
+    # -------------------------
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_factories_and_benchmark_suite(self):
+        from tasks.factories import seed
+        from tasks.management.commands.benchmark_api import compare, run_suite
+
+        users, categories, count = seed(users=5, tasks_per_user=4, categories=2)
+        self.assertEqual(count, 20)
+        bench_user = users[0]
+        created = Task.objects.filter(created_by=bench_user)
+        self.assertEqual(created.count(), 4)
+        # Every seeded task is visible to its creator and to each owner.
+        self.assertEqual(Task.objects.visible_to(bench_user).filter(created_by=bench_user).count(), 4)
+        owned = Task.objects.filter(owners=bench_user)
+        self.assertEqual(Task.objects.visible_to(bench_user).filter(pk__in=owned).count(), owned.count())
+
+        results = run_suite(bench_user, created.first(), runs=1, warmup=0)
+        for name in ("tasks.list", "tasks.search", "tasks.categories", "tasks.export",
+                     "tasks.import", "tasks.delete", "user.login"):
+            self.assertIn(name, results)
+        self.assertEqual({name: r["errors"] for name, r in results.items() if r["errors"]}, {})
+
+        slower = {name: dict(r, p95_ms=r["p95_ms"] * 2 + 1) for name, r in results.items()}
+        self.assertFalse(any(row[-1] for row in compare(results, results, 20)))
+        self.assertTrue(any(row[-1] for row in compare(results, slower, 20)))
+
+    # -------------------------
+    # Instrumentation
+    # -------------------------
+    @override_settings(PERFORMANCE_SERVER_TIMING=True, SLOW_QUERY_MS=0, SLOW_QUERY_SAMPLE_RATE=1)
+    def test_performance_middleware(self):
+        import json
+
+        task = Task.objects.create(title="Timed", created_by=self.user)
+        task.owners.add(self.user)
+        with self.assertLogs("tasktrackerAPI.requests", "INFO") as requests_log, \
+                self.assertLogs("tasktrackerAPI.slow_queries", "WARNING") as slow_log:
+            response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertIn("total;dur=", timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("serialize;dur=", timing)
+
+        entry = json.loads(requests_log.records[-1].getMessage())
+        self.assertEqual(entry["view"], "task_list")
+        self.assertEqual(entry["status"], 200)
+        self.assertGreater(entry["db_queries"], 0)
+        self.assertEqual(entry["response_bytes"], len(response.content))
+        self.assertIn("serialize_ms", entry)
+        self.assertIn("SELECT", json.loads(slow_log.records[0].getMessage())["sql"])
+
+        with override_settings(PERFORMANCE_SERVER_TIMING=False):
+            self.assertNotIn("Server-Timing", self.client.get(self.list_url))
+
+    # -------------------------
+    # Search
+    # -------------------------
+    def test_search_ranked_prefix_and_synced(self):
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        in_title = Task.objects.create(title="Deploy release", created_by=self.user)
+        in_description = Task.objects.create(
+            title="Weekly chores", description="remember to deploy", created_by=self.user
+        )
+        Task.objects.create(title="Deploy hidden", created_by=other)
+        url = reverse("task_search")
+
+        response = self.client.get(url, {"q": "depl"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["id"] for t in response.data], [in_title.id, in_description.id])
+
+        response = self.client.get(url, {"q": "deploy weekly", "fields": "id,title"})
+        self.assertEqual(response.data, [{"id": in_description.id, "title": "Weekly chores"}])
+
+        # Writes that bypass save() are indexed too.
+        Task.objects.filter(pk=in_description.pk).update(description="nothing here")
+        response = self.client.get(url, {"q": "deploy"})
+        self.assertEqual([t["id"] for t in response.data], [in_title.id])
+        in_title.delete()
+        self.assertEqual(self.client.get(url, {"q": "deploy"}).data, [])
+
+        self.assertEqual(self.client.get(url, {"q": "!!"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(url, {"q": "x", "limit": "0"}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    # -------------------------
+    # Categories
+    # -------------------------
+    def test_category_list_cached_and_invalidated(self):
+        url = reverse("category_list")
+        response = self.client.get(url)
+        self.assertEqual(response.data, [{"id": self.category.id, "name": "Work", "description": ""}])
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            home = Category.objects.create(name="Home")
+        response = self.client.get(url)
+        self.assertEqual([c["name"] for c in response.data], ["Home", "Work"])
+        self.assertNotEqual(response["ETag"], cached["ETag"])
+
+        # Name filters resolve through the cached list: no join on category.
+        Task.objects.create(title="Chores", created_by=self.user, category=home)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(list(Task.objects.with_category("HOME").values_list("title", flat=True)), ["Chores"])
+        self.assertNotIn("tasks_category", ctx.captured_queries[-1]["sql"])
+        self.assertFalse(Task.objects.with_category("missing").exists())
+
+    @override_settings(CACHE_VERSION_TIMEOUT=5)
+    def test_category_cache_bounded_without_shared_versions(self):
+        import time
+        from unittest import mock
+        from tasks.cache import category_ids_named
+
+        self.assertEqual(category_ids_named("work"), [self.category.id])
+        # Created by another worker: its version bump never reaches this process.
+        Category.objects.bulk_create([Category(name="Home")])
+        self.assertEqual(category_ids_named("home"), [])
+        with mock.patch("time.time", return_value=time.time() + 6):
+            self.assertEqual(len(category_ids_named("home")), 1)
+
+    # -------------------------
+    # Admin
+    # -------------------------
+    @override_settings(STORAGES=PLAIN_STORAGES)
+    def test_admin_search_orders_by_relevance(self):
+        staff = self.User.objects.create_superuser(username="staff", password="pass1234")
+        Task.objects.create(title="Deploy the api", created_by=self.user)
+        Task.objects.create(title="Zeta", description="deploy notes", created_by=self.user)
+        self.client.force_login(staff)
+        url = reverse("admin:tasks_task_changelist")
+
+        def titles(**params):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [t.title for t in response.context["cl"].result_list]
+
+        # Title hits rank above description hits, although "Zeta" is newer.
+        self.assertEqual(titles(q="deploy"), ["Deploy the api", "Zeta"])
+        # A sorted column still wins over relevance.
+        self.assertEqual(titles(q="deploy", o="1"), ["Deploy the api", "Zeta"])
+        self.assertEqual(titles(q="deploy", o="-1"), ["Zeta", "Deploy the api"])
+        self.assertEqual(titles(q="!!"), [])
+
+    @override_settings(STORAGES=PLAIN_STORAGES)
+    def test_admin_changelist_queries_and_cached_facets(self):
+        from tasks.pagination import EstimatedCountPaginator
+
+        staff = self.User.objects.create_superuser(username="staff", password="pass1234")
+        for i in range(5):
+            Task.objects.create(title=f"Admin {i}", created_by=self.user, category=self.category)
+        self.client.force_login(staff)
+        url = reverse("admin:tasks_task_changelist")
+
+        response = self.client.get(url, {"_facets": "1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Admin 4")
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(url, {"_facets": "1", "state": "open"})
+        with CaptureQueriesContext(connection) as cached:
+            self.client.get(url, {"_facets": "1", "state": "open"})
+        # Facet counts come from the cache; created_by is joined, not fetched per row.
+        self.assertLess(len(cached), len(first))
+        self.assertLessEqual(len(cached), 8)
+
+        # Exact counts below the threshold (and always on SQLite).
+        self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 2).count, 5)
+
+    # -------------------------
+    # Fast JSON list path
+    # -------------------------
+    def test_fast_json_matches_serializer_bytes(self):
+        from unittest import mock
+        from tasks import fastjson
+
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        tricky = Task.objects.create(
+            title='Quote " slash \\ line para  \x01 ctrl é漢\U0001F600',
+            description="tab\tnewline\n",
+            created_by=self.user,
+            category=self.category,
+            due_date=timezone.now().replace(microsecond=0) + timezone.timedelta(days=2),
+        )
+        tricky.owners.add(other, self.user)
+        for i in range(3):
+            Task.objects.create(title=f"Plain {i}", created_by=self.user)
+
+        queries = [
+            {},
+            {"fields": "id,owners,due_date"},
+            {"limit": "2", "ordering": "due_date"},
+            {"limit": "2", "fields": "title"},
+        ]
+        for params in queries:
+            with override_settings(TASK_LIST_FAST_JSON=False):
+                expected = self.client.get(self.list_url, params)
+            for encoder in (fastjson.orjson, None):
+                with self.subTest(params=params, orjson=encoder is not None), \
+                        mock.patch.object(fastjson, "orjson", encoder):
+                    response = self.client.get(self.list_url, params)
+                    self.assertIsInstance(response, fastjson.PrerenderedResponse)
+                    self.assertEqual(response.content, expected.content)
+                    self.assertEqual(response["Content-Type"], expected["Content-Type"])
+
+        # The browsable API still goes through the serializer.
+        with override_settings(STORAGES=PLAIN_STORAGES):
+            response = self.client.get(self.list_url, HTTP_ACCEPT="text/html")
+        self.assertNotIsInstance(response, fastjson.PrerenderedResponse)
+
+    # -------------------------
+    # Streaming export
+    # -------------------------
+    def test_export_streams_ndjson_and_csv(self):
+        import csv
+        import json
+        from tasks import export
+
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        first = Task.objects.create(title="First", created_by=self.user, category=self.category)
+        first.owners.add(self.user, other)
+        for i in range(4):
+            Task.objects.create(title=f"Task {i}", created_by=self.user)
+        Task.objects.create(title="Hidden", created_by=other)
+        url = reverse("task_export")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="tasks.ndjson"', response["Content-Disposition"])
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([r["title"] for r in records], ["First", "Task 0", "Task 1", "Task 2", "Task 3"])
+        self.assertEqual(records[0]["category"], "Work")
+        self.assertEqual(records[0]["owners"], ["testuser", "other"])
+        self.assertEqual(records[0]["created_by"], "testuser")
+        self.assertEqual(list(records[0]), export.COLUMNS)
+
+        for params, accept in (({"output": "csv"}, None), ({}, "text/csv")):
+            response = self.client.get(url, params, **({"HTTP_ACCEPT": accept} if accept else {}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+            rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+            self.assertEqual(rows[0], export.COLUMNS)
+            self.assertEqual(len(rows), 6)
+            self.assertEqual(rows[1][export.COLUMNS.index("owners")], "testuser;other")
+
+        # List filters apply; unknown output is rejected.
+        response = self.client.get(url, {"category": "work"})
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 1)
+        self.assertEqual(self.client.get(url, {"output": "xml"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Owners and usernames are resolved per chunk, not per task.
+        qs = Task.objects.visible_to(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            chunks = list(export.ndjson_stream(qs, chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertLessEqual(len(ctx), 1 + 1 + 2 * 3)  # categories, tasks, owners + users per chunk
+
+    # -------------------------
+    # Bulk import
+    # -------------------------
+    def test_import_chunks_skips_bad_rows_and_resumes(self):
+        import json
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.db import DatabaseError
+        from tasks import importer
+        from tasks.models import ImportJob, TaskMembership
+
+        other = self.User.objects.create_user(username="other", password="pass1234")
+        url = reverse("task_import")
+        past = "2020-01-01T00:00:00Z"
+        csv_body = (
+            "title,priority,state,due_date,category,owners\n"
+            f"Late,high,open,{past},work,other;testuser\n"
+            f"Done late,1,done,{past},,\n"
+            ",2,open,,,\n"
+            "Bad owner,2,open,,,ghost\n"
+        ).encode()
+        response = self.client.post(url, {"file": SimpleUploadedFile("tasks.csv", csv_body)})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual((response.data["created_count"], response.data["skipped_count"]), (2, 2))
+        self.assertEqual([e["row"] for e in response.data["errors"]], [3, 4])
+
+        late = Task.objects.get(title="Late")
+        self.assertEqual((late.priority, late.category, late.is_overdue), (3, self.category, True))
+        self.assertEqual(sorted(late.owners.values_list("username", flat=True)), ["other", "testuser"])
+        self.assertTrue(TaskMembership.objects.filter(task=late, user=other).exists())
+        self.assertFalse(Task.objects.get(title="Done late").is_overdue)
+        self.assertEqual(len(self.client.get(self.list_url).data), 2)
+        self.assertEqual(
+            self.client.get(reverse("import_detail", args=[response.data["id"]])).data["rows_done"], 4
+        )
+
+        # A JSON array read in small blocks; the second chunk fails once, then resumes.
+        rows = [{"title": f"Row {i}", "owners": ["other"]} for i in range(5)]
+        body = json.dumps(rows, indent=1).encode()
+        real_bulk_create = Task.objects.bulk_create
+        calls = []
+
+        def flaky_bulk_create(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 2:
+                raise DatabaseError("connection lost")
+            return real_bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(importer, "READ_SIZE", 16), \
+                mock.patch.object(importer, "CHUNK_SIZE", 2), \
+                mock.patch.object(Task.objects, "bulk_create", flaky_bulk_create):
+            response = self.client.post(url, {"file": SimpleUploadedFile("tasks.json", body)})
+            self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            job = ImportJob.objects.get(pk=response.data["job"]["id"])
+            self.assertEqual((job.status, job.rows_done, job.created_count), ("failed", 2, 2))
+
+            # Resuming needs the same file.
+            response = self.client.post(
+                url, {"file": SimpleUploadedFile("tasks.json", b"[]"), "job": job.pk}
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    url, {"file": SimpleUploadedFile("tasks.json", body), "job": job.pk}
+                )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["status"], response.data["created_count"]), ("done", 5))
+        self.assertEqual(Task.objects.filter(title__startswith="Row ").count(), 5)
+        self.assertEqual(Task.objects.filter(owners=other, title__startswith="Row ").count(), 5)
+        # Usernames are looked up once, not per chunk or row.
+        self.assertEqual(sum('"auth_user"."username" IN' in q["sql"] for q in ctx.captured_queries), 1)
+
+        for bad in ("abc", "0", "9" * 23):
+            response = self.client.post(url, {"file": SimpleUploadedFile("tasks.json", body), "job": bad})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=bad)
+
+        # Files too big to import within a request are refused up front.
+        jobs = ImportJob.objects.count()
+        with override_settings(TASK_IMPORT_MAX_BYTES=len(body) - 1):
+            response = self.client.post(url, {"file": SimpleUploadedFile("tasks.json", body)})
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertIn("import_tasks", response.data["detail"])
+        self.assertEqual(ImportJob.objects.count(), jobs)
+
+    # -------------------------
+    # Database connection modes
+    # -------------------------
+    def test_database_pool_settings(self):
+        import os
+        import runpy
+        from unittest import mock
+        from django.core.exceptions import ImproperlyConfigured
+
+        def database(pool):
+            env = {"DATABASE_URL": "postgres://u:p@db.example.com/app", "DATABASE_POOL": pool}
+            with mock.patch.dict(os.environ, env):
+                return runpy.run_module("tasktrackerAPI.settings")["DATABASES"]["default"]
+
+        default = database("")
+        self.assertEqual((default["CONN_MAX_AGE"], default["CONN_HEALTH_CHECKS"]), (600, True))
+        self.assertNotIn("pool", default["OPTIONS"])
+
+        pooled = database("psycopg")
+        self.assertEqual((pooled["CONN_MAX_AGE"], pooled["CONN_HEALTH_CHECKS"]), (0, False))
+        self.assertEqual(pooled["OPTIONS"]["sslmode"], "require")
+        self.assertLessEqual(pooled["OPTIONS"]["pool"]["min_size"], pooled["OPTIONS"]["pool"]["max_size"])
+        self.assertEqual(pooled["OPTIONS"]["pool"]["max_size"], 1)  # gunicorn's default threads
+        self.assertTrue(callable(pooled["OPTIONS"]["pool"]["check"]))
+
+        bouncer = database("pgbouncer")
+        self.assertTrue(bouncer["DISABLE_SERVER_SIDE_CURSORS"])
+        self.assertTrue(bouncer["CONN_HEALTH_CHECKS"])
+        with self.assertRaises(ImproperlyConfigured):
+            database("bogus")
+
+    def test_benchmark_reconnect_mode(self):
+        from tasks.management.commands.benchmark_api import run_suite
+
+        task = Task.objects.create(title="Bench", created_by=self.user)
+        results = run_suite(self.user, task, runs=2, warmup=0, only=["tasks.list"], reconnect=True)
+        self.assertEqual({r["errors"] for r in results.values()}, {0})
+
+    # -------------------------
+    # Read replicas
+    # -------------------------
+    @override_settings(
+        DATABASE_REPLICAS=["replica1"],
+        DATABASE_ROUTERS=["tasktrackerAPI.db_router.ReplicaRouter"],
+        REPLICA_PIN_SECONDS=5,
+    )
+    def test_replica_routing_pins_after_writes(self):
+        from unittest import mock
+        from django.db import router
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from tasktrackerAPI import db_router
+        from tasktrackerAPI.db_router import ReplicaPinningMiddleware, is_pinned
+
+        seen = []
+
+        def view(request):
+            seen.append(Task.objects.all().db)
+            if request.GET.get("write"):
+                router.db_for_write(Task)
+                seen.append(Task.objects.all().db)
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        factory = RequestFactory()
+
+        # TestCase wraps the test in a transaction, which keeps reads on the primary.
+        self.assertEqual(Task.objects.all().db, "default")
+        outside_transaction = mock.patch.object(connection, "in_atomic_block", False)
+        outside_transaction.start()
+        self.addCleanup(outside_transaction.stop)
+
+        middleware(factory.get("/"))
+        self.assertEqual(seen.pop(), "replica1")
+        self.assertFalse(is_pinned())
+        # Writes go to the primary and so do later reads in the same request.
+        self.assertEqual(router.db_for_write(Task), "default")
+        self.assertTrue(is_pinned())
+        db_router._pinned.set(False)
+
+        # Unsafe methods start pinned; a read-only POST leaves no pin behind.
+        response = middleware(factory.post("/"))
+        self.assertEqual(seen.pop(), "default")
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+        # A GET that writes pins the client: by cookie and by Authorization header.
+        auth = {"HTTP_AUTHORIZATION": "Bearer abc"}
+        response = middleware(factory.get("/", {"write": "1"}, **auth))
+        self.assertEqual(seen[-2:], ["replica1", "default"])
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        middleware(factory.get("/", **auth))
+        self.assertEqual(seen.pop(), "default")
+        request = factory.get("/")
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = "1"
+        middleware(request)
+        self.assertEqual(seen.pop(), "default")
+        middleware(factory.get("/", HTTP_AUTHORIZATION="Bearer other"))
+        self.assertEqual(seen.pop(), "replica1")
+        self.assertFalse(is_pinned())
+
+
+    # -------------------------
+    # Throttling and load shedding
+    # -------------------------
+    def test_throttles_split_read_write_and_ip_budgets(self):
+        from tasktrackerAPI.throttling import hit
+
+        rates = dict(settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], read="3/min", read_ip="4/min")
+        with override_settings(REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates)):
+            for _ in range(3):
+                self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_200_OK)
+            response = self.client.get(self.list_url)
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertGreater(int(response["Retry-After"]), 0)
+            # Writes have their own budget.
+            response = self.client.post(self.list_url, {"title": "Still allowed"}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+            # Another user from the same IP has a fresh user budget but shares the IP one.
+            other = self.User.objects.create_user(username="other", password="pass1234")
+            self.client.force_authenticate(other)
+            self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            with override_settings(THROTTLING_ENABLED=False):
+                self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_200_OK)
+
+        # Behind one proxy the client IP is the entry that proxy appended, not a
+        # value the client put in X-Forwarded-For itself.
+        from django.test import RequestFactory
+        from rest_framework.request import Request
+        from tasktrackerAPI.throttling import IPThrottle
+
+        request = Request(RequestFactory().get("/", HTTP_X_FORWARDED_FOR="10.0.0.1, 203.0.113.7"))
+        self.assertEqual(IPThrottle().get_ident(request), "203.0.113.7")
+
+        # Sliding window: the previous window counts in proportion to its overlap.
+        cache.clear()
+        self.assertEqual([hit("t", 2, 60, now=600 + i) for i in range(2)], [0, 0])
+        self.assertEqual(hit("t", 2, 60, now=630), 30)  # 3rd in this window: wait for the next
+        self.assertGreater(hit("t", 2, 60, now=675), 0)  # 3 * 0.75 + 1 > 2
+        self.assertEqual(hit("t", 2, 60, now=770), 0)    # 1 * 0.17 + 1 <= 2
+
+    def test_async_views_apply_throttles(self):
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+        from accounts.tokens import RefreshToken
+        from tasks import async_views
+
+        task = Task.objects.create(title="Mine", created_by=self.user)
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        factory = RequestFactory()
+        rates = dict(settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], read="2/min")
+        with override_settings(REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates)):
+            response = async_to_sync(async_views.task_list)(factory.get(self.list_url, **auth))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            detail = async_to_sync(async_views.task_detail)
+            self.assertEqual(detail(factory.get("/", **auth), pk=task.pk).status_code, status.HTTP_200_OK)
+            response = async_to_sync(async_views.task_list)(factory.get(self.list_url, **auth))
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertGreater(int(response["Retry-After"]), 0)
+            self.assertIn("throttled", json.loads(response.content)["detail"])
+            # The budget is shared with the DRF views.
+            self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_load_shedding_returns_503_with_retry_after(self):
+        import time
+        from unittest import mock
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from tasktrackerAPI.middleware import LoadSheddingMiddleware
+
+        with override_settings(LOAD_SHED_QUEUE_MS=500, LOAD_SHED_RETRY_AFTER=3):
+            queued = str(int((time.time() - 2) * 1000))  # Heroku: epoch milliseconds
+            origin = settings.CORS_ALLOWED_ORIGINS[0]
+            response = self.client.get(self.list_url, HTTP_X_REQUEST_START=queued, HTTP_ORIGIN=origin)
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(response["Retry-After"], "3")
+            self.assertEqual(response["Access-Control-Allow-Origin"], origin)
+            fresh = f"t={time.time():.3f}"  # nginx: epoch seconds
+            self.assertEqual(
+                self.client.get(self.list_url, HTTP_X_REQUEST_START=fresh).status_code, status.HTTP_200_OK
+            )
+
+        middleware = LoadSheddingMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get("/")
+        with override_settings(LOAD_SHED_MAX_IN_FLIGHT=1):
+            self.assertEqual(middleware(request).status_code, 200)
+            middleware.in_flight = 1
+            self.assertEqual(middleware(request).status_code, 503)
+            middleware.in_flight = 0
+        with override_settings(LOAD_SHED_LATENCY_MS=100), mock.patch("random.random", return_value=0.5):
+            middleware.latency_ms = 300  # twice over: sheds 90%
+            self.assertEqual(middleware(request).status_code, 503)
+            middleware.latency_ms = 120  # 20% over: sheds 20%
+            self.assertEqual(middleware(request).status_code, 200)
+
+
+class QueryPlanTests(APITestCase):
+    """
+    EXPLAIN the hot TaskQuerySet methods and check they are served by the
+    indexes meant for them. On PostgreSQL sequential scans are disabled for
+    the check, since on tiny test tables the planner would rightly prefer
+    them; what matters is that a matching index exists and is usable.
+    """
+
+    HOT_QUERIES = {
+        "created_by": (lambda user, now: Task.objects.created_by(user).order_by("-created_at")[:50],
+                       "tasks_task_creator_idx"),
+        "owned_by": (lambda user, now: Task.objects.owned_by(user), "tasks_task_owners_user_task_idx"),
+        # SQLite names indexes declared inside CREATE TABLE itself.
+        "visible_to": (lambda user, now: Task.objects.visible_to(user),
+                       ("tasks_membership_unique", "sqlite_autoindex_tasks_taskmembership_1")),
+        # Unordered, as counted by the summary and batched by sweep_overdue.
+        "overdue": (lambda user, now: Task.objects.overdue().order_by(), "tasks_task_overdue_idx"),
+        "past_due": (lambda user, now: Task.objects.past_due(now).order_by(), "tasks_task_due_open_idx"),
+    }
+
+    def query_plan(self, qs):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")  # test transaction scope
+        return qs.explain()
+
+    def test_hot_queries_use_their_indexes(self):
+        user = get_user_model().objects.create_user(username="planner", password="pass1234")
+        now = timezone.now()
+        for name, (build, indexes) in self.HOT_QUERIES.items():
+            with self.subTest(query=name):
+                plan = self.query_plan(build(user, now))
+                indexes = (indexes,) if isinstance(indexes, str) else indexes
+                self.assertTrue(any(index in plan for index in indexes), plan)
+                if connection.vendor == "postgresql":
+                    self.assertNotIn("Seq Scan", plan)
@@ -1,7 +1,20 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI, list/detail reads run on the event loop; writes still go
+# through the DRF views (the async views delegate non-GET methods).
+read_views = async_views if settings.TASKS_ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("", views.task_list, name="task_list"),            # GET list, POST create
-    path("<int:pk>/", views.task_detail, name="task_detail")# GET / PATCH / PUT single
+    path("", read_views.task_list, name="task_list"),            # GET list, POST create
+    path("bulk/", views.task_bulk, name="task_bulk"),       # POST batched create/update/delete
+    path("summary/", views.task_summary, name="task_summary"),  # GET dashboard counts
+    path("changes/", views.task_changes, name="task_changes"),  # GET incremental sync
+    path("search/", views.task_search, name="task_search"),     # GET ranked full-text search
+    path("categories/", views.category_list, name="category_list"),  # GET cached category list
+    path("export/", views.task_export, name="task_export"),     # GET streamed NDJSON/CSV
+    path("import/", views.task_import, name="task_import"),     # POST CSV/NDJSON/JSON file
+    path("import/<int:pk>/", views.import_detail, name="import_detail"),  # GET import progress
+    path("<int:pk>/", read_views.task_detail, name="task_detail")# GET / PATCH / PUT single
 ]
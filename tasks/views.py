@@ -1,24 +1,190 @@
-from django.db.models import Q
-from rest_framework.decorators import api_view, permission_classes
+import hashlib
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Task
-from .serializers import TaskSerializer
+from . import export, fastjson, importer
+from .bulk import BulkValidationError, apply_bulk
+from .cache import get_categories, get_category_version, get_task_summary, get_task_version
+from .filters import filter_tasks, parse_id, parse_ordering
+from .models import ImportJob, Task
+from .pagination import KeysetPagination
+from .search import search_tasks
+from .serializers import ImportJobSerializer, TaskSerializer
+from .sync import changes_since
+
+# Serializer fields that can't be deferred with .only() (reverse/M2M relations).
+NON_COLUMN_FIELDS = {"owners"}
+
+# Cheap aggregate over the visible set that the list ETag is derived from.
+LIST_STATE = {"count": Count("id"), "last": Max("updated_at")}
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+def _requested_fields(params):
+    """
+    Parse ``?fields=a,b,c`` into a list of serializer field names.
+    Returns None when the parameter is absent (i.e. render everything).
+    """
+    raw = params.get("fields")
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = set(fields) - set(TaskSerializer.Meta.fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}.")
+    return fields
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.md5(":".join(map(str, parts)).encode()).hexdigest())
+
+
+def list_query(request):
+    """
+    Parse task list parameters into ``(fields, paginator, qs)``; ``qs`` is the
+    filtered visible set. Raises ValueError on bad input. Resolving filter
+    values can query (category names on a cache miss), so the async views
+    call it through sync_to_async.
+    """
+    params = request.GET
+    fields = _requested_fields(params)
+    paginator = KeysetPagination(request, Task, parse_ordering(params))
+    qs = filter_tasks(Task.objects.visible_to(request.user), params, request.user)
+    return fields, paginator, qs
+
+
+def list_etag(request, state):
+    # count + max(updated_at) catch edits and most deletes; the per-user
+    # version (bumped on any membership/task change) catches the rest.
+    version = get_task_version(request.user.pk)
+    return _etag(version, state["count"], state["last"], request.get_full_path())
+
+
+def load_fields(qs, fields, *extra_columns):
+    """Load only what rendering ``fields`` (None = all) needs."""
+    if fields is None:
+        return qs.with_relations()
+    columns = set(fields) - NON_COLUMN_FIELDS
+    qs = qs.only(*columns | {"id", *extra_columns})
+    if "owners" in fields:
+        qs = qs.with_owners()
+    return qs
+
+
+def list_page_queryset(qs, fields, paginator):
+    """The lazy queryset that fetches exactly the rows and columns to render."""
+    qs = load_fields(qs, fields, paginator.field)
+    if paginator.enabled:
+        return paginator.paginate_queryset(qs)
+    return paginator.order_queryset(qs)
+
+
+def list_data(rows, fields, paginator):
+    if not paginator.enabled:
+        return TaskSerializer(rows, many=True, fields=fields).data
+    rows, cursor = paginator.split_page(rows)
+    data = TaskSerializer(rows, many=True, fields=fields).data
+    return paginator.get_paginated_data(data, cursor)
+
+
+def fast_json(qs):
+    """Whether list GETs can skip the serializer (see fastjson.py)."""
+    return settings.TASK_LIST_FAST_JSON and fastjson.supported(qs)
+
+
+def fast_page_queryset(qs, fields, paginator):
+    """Like list_page_queryset, as tuples (plus ordering value and id for the cursor)."""
+    qs = fastjson.values_queryset(qs, fastjson.field_names(fields), paginator.field, "id")
+    if paginator.enabled:
+        return paginator.paginate_queryset(qs)
+    return paginator.order_queryset(qs)
+
+
+def fast_list_body(rows, fields, paginator):
+    """The JSON bytes list_data() + JSONRenderer would produce for these rows."""
+    names = fastjson.field_names(fields)
+    if not paginator.enabled:
+        return fastjson.render(rows, names)
+    rows, cursor = paginator.split_page(rows, key=lambda row: row[-2:])
+    return fastjson.render(rows, names, lambda data: paginator.get_paginated_data(data, cursor))
+
+
+def detail_etag(task):
+    return _etag(task.pk, task.updated_at.isoformat())
+
+
+def conditional_response(request, etag, last_modified):
+    """
+    Return a 304 response if the client's validators still match, else None.
+    Runs before serialization so unchanged polls skip it entirely. The 304
+    carries the same validators, Cache-Control and Vary as the 200 would.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None and response.status_code == status.HTTP_304_NOT_MODIFIED:
+        with_validators(response, etag, last_modified)
+    return response
+
+
+def with_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
 
 
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def task_list(request):
+    """
+    - GET  /api/tasks/   list tasks the user participates in
+        ?state=…&priority=…  facet filters (see filters.filter_tasks)
+        ?ordering=-due_date  sort on an indexed column (default -created_at)
+        ?fields=id,title     sparse fieldset
+        ?limit=50&cursor=…   keyset pagination in the requested ordering
+    - POST /api/tasks/   create a task
+    """
     if request.method == "GET":
-        qs = Task.objects.filter(Q(created_by=request.user) | Q(owners=request.user)).distinct()
-        return Response(TaskSerializer(qs, many=True).data)
+        try:
+            fields, paginator, qs = list_query(request)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        state = qs.aggregate(**LIST_STATE)
+        etag = list_etag(request, state)
+        # ETag only: Max(updated_at) misses deletions and unshares, so
+        # If-Modified-Since alone would answer 304 to a stale list.
+        not_modified = conditional_response(request, etag, None)
+        if not_modified:
+            return not_modified
+
+        if request.accepted_renderer.format == "json" and fast_json(qs):
+            rows = list(fast_page_queryset(qs, fields, paginator))
+            body = fast_list_body(rows, fields, paginator)
+            response = fastjson.PrerenderedResponse(body)
+        else:
+            rows = list(list_page_queryset(qs, fields, paginator))
+            response = Response(list_data(rows, fields, paginator))
+        return with_validators(response, etag, None)
 
     # POST (create)
     serializer = TaskSerializer(data=request.data)
     if serializer.is_valid():
         task = serializer.save(created_by=request.user)
-        if task.owners.count() == 0:
+        if not serializer.validated_data.get("owners"):
             task.owners.add(request.user)
         return Response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -35,21 +201,25 @@ def task_detail(request, pk: int):
     - DELETE  /api/tasks/<pk>/
     """
     try:
-        task = Task.objects.filter(
-            Q(created_by=request.user) | Q(owners=request.user)
-        ).distinct().get(pk=pk)
+        task = Task.objects.visible_to(request.user).with_relations().get(pk=pk)
     except Task.DoesNotExist:
         return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        return Response(TaskSerializer(task).data)
+        etag = detail_etag(task)
+        not_modified = conditional_response(request, etag, task.updated_at)
+        if not_modified:
+            return not_modified
+        return with_validators(Response(TaskSerializer(task).data), etag, task.updated_at)
 
     if request.method in ["PATCH", "PUT"]:
         partial = request.method == "PATCH"
         serializer = TaskSerializer(task, data=request.data, partial=partial)
         if serializer.is_valid():
+            owners = serializer.validated_data.get("owners")
             updated = serializer.save()
-            if updated.owners.count() == 0:
+            # Untouched owners are still in the prefetch cache, so no COUNT query.
+            if not (updated.owners.all() if owners is None else owners):
                 updated.owners.add(request.user)
             return Response(TaskSerializer(updated).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -57,3 +227,191 @@ def task_detail(request, pk: int):
     if request.method == "DELETE":
         task.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def task_bulk(request):
+    """
+    POST /api/tasks/bulk/
+    {"create": [{...}], "update": [{"id": 1, ...}], "delete": [2, 3]}
+
+    All operations run in one transaction; nothing is applied if any item
+    is invalid, and the 400 body lists errors aligned with the request lists.
+    """
+    if not isinstance(request.data, dict):
+        return Response({"detail": "Expected an object."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        result = apply_bulk(request.user, request.data)
+    except BulkValidationError as exc:
+        return Response(exc.errors, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def task_import(request):
+    """
+    POST /api/tasks/import/ (multipart: file, optional input=csv|ndjson|json, job)
+
+    Imports the file in chunks and returns the job. ``input`` defaults to
+    the file extension. To resume a failed import, post the same file with
+    ``job`` set to its id; rows that were already imported are skipped.
+    Files over TASK_IMPORT_MAX_BYTES are refused with 413.
+    """
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"detail": "file is required."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = settings.TASK_IMPORT_MAX_BYTES
+    if limit and upload.size > limit:
+        detail = (
+            f"File is larger than {limit} bytes. Split it, or run "
+            "`manage.py import_tasks` on the server for large imports."
+        )
+        return Response({"detail": detail}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    input_format = request.data.get("input") or importer.detect_format(upload.name)
+    if input_format not in importer.FORMATS.values():
+        return Response(
+            {"detail": "input must be one of: csv, ndjson, json."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    job = None
+    if request.data.get("job"):
+        try:
+            job_id = parse_id(request.data["job"], "job")
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        job = ImportJob.objects.filter(user=request.user, pk=job_id).first()
+        if job is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        job = importer.prepare_job(request.user, upload, input_format, upload.name, job)
+    except importer.ImportFormatError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        importer.run_import(job, upload)
+    except importer.ImportFormatError as exc:
+        data = {"detail": str(exc), "job": ImportJobSerializer(job).data}
+        return Response(data, status=status.HTTP_400_BAD_REQUEST)
+    except DatabaseError:
+        # The job keeps its committed progress; post the file again to resume.
+        data = {"detail": "Import failed.", "job": ImportJobSerializer(job).data}
+        return Response(data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    code = status.HTTP_200_OK if request.data.get("job") else status.HTTP_201_CREATED
+    return Response(ImportJobSerializer(job).data, status=code)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def import_detail(request, pk: int):
+    """GET /api/tasks/import/{id}/: progress and row errors of an import."""
+    job = ImportJob.objects.filter(user=request.user, pk=pk).first()
+    if job is None:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ImportJobSerializer(job).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def task_search(request):
+    """
+    GET /api/tasks/search/?q=<words>&limit=20
+    Visible tasks whose title/description match every word (as a prefix),
+    best match first. Also accepts the task list filters and ``fields``.
+    """
+    params = request.GET
+    try:
+        limit = int(params.get("limit", SEARCH_LIMIT))
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"detail": f"limit must be between 1 and {MAX_SEARCH_LIMIT}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        fields = _requested_fields(params)
+        qs = filter_tasks(Task.objects.visible_to(request.user), params, request.user)
+        qs = search_tasks(qs, params.get("q"))
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    tasks = load_fields(qs, fields)[:limit]
+    return Response(TaskSerializer(tasks, many=True, fields=fields).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, export.NDJSONRenderer, export.CSVRenderer])
+def task_export(request):
+    """
+    GET /api/tasks/export/?output=ndjson|csv
+    Stream every visible task (list filters apply) with category names and
+    owner/creator usernames. ``output`` defaults to the Accept type, else
+    NDJSON; it isn't called ``format`` because DRF reserves that parameter.
+    """
+    default = request.accepted_renderer.format
+    output = request.GET.get("output") or (default if default in export.FORMATS else "ndjson")
+    if output not in export.FORMATS:
+        return Response(
+            {"detail": f"output must be one of: {', '.join(export.FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        qs = filter_tasks(Task.objects.visible_to(request.user), request.GET, request.user)
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    content_type, filename = export.FORMATS[output]
+    response = StreamingHttpResponse(export.stream(qs, output), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def task_summary(request):
+    """
+    GET /api/tasks/summary/
+    Dashboard counts by state and priority, plus overdue and due-this-week.
+    """
+    return Response(get_task_summary(request.user))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def category_list(request):
+    """
+    GET /api/tasks/categories/
+    All categories (id, name, description) by name. Served from the cache
+    and revalidated with the category version as ETag.
+    """
+    etag = _etag("categories", get_category_version())
+    not_modified = conditional_response(request, etag, None)
+    if not_modified:
+        return not_modified
+    return with_validators(Response(get_categories()), etag, None)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def task_changes(request):
+    """
+    GET /api/tasks/changes/?since=<token>
+    Tasks created/updated after the token (oldest first) and ids of tasks
+    deleted or unshared since then. Omit ``since`` for a full initial sync,
+    then keep passing back ``next``; repeat immediately while ``has_more``.
+    Recent changes are sent again on the next sync (see sync.py).
+    """
+    try:
+        tasks, deleted, token, has_more = changes_since(
+            request.user, request.query_params.get("since")
+        )
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        "changes": TaskSerializer(tasks, many=True).data,
+        "deleted": deleted,
+        "next": token,
+        "has_more": has_more,
+    })
@@ -0,0 +1,118 @@
+"""
+Read-replica routing.
+
+Reads go to a random alias from DATABASE_REPLICAS; writes go to the
+primary ("default") and pin the rest of the request to it, so a request
+never reads its own write from a replica that hasn't caught up. The pin
+also outlives the request: after a write, ``ReplicaPinningMiddleware``
+remembers the client for REPLICA_PIN_SECONDS, as a cookie (browser
+sessions) and as a shared-cache entry keyed on the Authorization header
+(API clients, whose cross-site requests don't carry the cookie). That
+client's next requests read from the primary too (read-your-writes).
+
+Reads inside a transaction on the primary also stay on the primary.
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_pinned = ContextVar("db_pinned_to_primary", default=False)
+_wrote = ContextVar("db_wrote", default=False)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas hold the same data as the primary
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Scope the primary pin to the request: start pinned for unsafe methods
+    and for clients that wrote in the last REPLICA_PIN_SECONDS, and
+    remember clients whose request wrote. Does nothing without replicas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        key = self.pin_key(request)
+        pinned = self.pinned_by_request(request) or bool(key and cache.get(key))
+        tokens = _pinned.set(pinned), _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get():
+                self.set_cookie(response)
+                if key:
+                    cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+            return response
+        finally:
+            _pinned.reset(tokens[0])
+            _wrote.reset(tokens[1])
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+        key = self.pin_key(request)
+        pinned = self.pinned_by_request(request) or bool(key and await cache.aget(key))
+        tokens = _pinned.set(pinned), _wrote.set(False)
+        try:
+            response = await self.get_response(request)
+            if _wrote.get():
+                self.set_cookie(response)
+                if key:
+                    await cache.aset(key, True, settings.REPLICA_PIN_SECONDS)
+            return response
+        finally:
+            _pinned.reset(tokens[0])
+            _wrote.reset(tokens[1])
+
+    def pin_key(self, request):
+        auth = request.headers.get("Authorization")
+        return f"db:pin:{hashlib.sha256(auth.encode()).hexdigest()}" if auth else None
+
+    def pinned_by_request(self, request):
+        return request.method not in SAFE_METHODS or settings.REPLICA_PIN_COOKIE in request.COOKIES
+
+    def set_cookie(self, response):
+        response.set_cookie(
+            settings.REPLICA_PIN_COOKIE,
+            "1",
+            max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
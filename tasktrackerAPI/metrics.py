@@ -0,0 +1,111 @@
+"""
+Per-request performance counters, collected by ``PerformanceMiddleware``.
+
+The active request's ``RequestMetrics`` lives in a ContextVar, so it follows
+the request through threads (WSGI) and through ``sync_to_async`` hops
+(ASGI). Outside a request every hook here is a no-op.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+
+_current = ContextVar("request_metrics", default=None)
+
+MAX_SQL_LENGTH = 2000
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.timings = {}  # name -> milliseconds, e.g. {"serialize": 1.2}
+        self.slow_queries = []  # (milliseconds, sql)
+
+    @property
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def add_timing(self, name, ms):
+        self.timings[name] = self.timings.get(name, 0.0) + ms
+
+
+def start():
+    """Begin collecting for the current context; returns ``(metrics, token)``."""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def timed(name):
+    """Add the block's duration to the current request's ``name`` timing."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_timing(name, (time.perf_counter() - started) * 1000)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper: count every query and keep a sample of slow ones."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        ms = (time.perf_counter() - started) * 1000
+        metrics.queries += 1
+        metrics.sql_ms += ms
+        if ms >= settings.SLOW_QUERY_MS and random.random() < settings.SLOW_QUERY_SAMPLE_RATE:
+            metrics.slow_queries.append((ms, sql[:MAX_SQL_LENGTH]))
+
+
+def _install(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install():
+    """Wrap every current and future database connection (idempotent)."""
+    connection_created.connect(_install, dispatch_uid="tasktrackerAPI.metrics")
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Count ``.data`` rendering as serializer time. For ``many=True``, also set
+    ``Meta.list_serializer_class = TimedListSerializer``.
+    """
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
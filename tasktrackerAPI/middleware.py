@@ -1,6 +1,22 @@
 # tasktrackerAPI/middleware.py
+import json
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from accounts.hashers import HashingBusy
+
+from . import metrics
+
+request_logger = logging.getLogger("tasktrackerAPI.requests")
+slow_query_logger = logging.getLogger("tasktrackerAPI.slow_queries")
+shed_logger = logging.getLogger("tasktrackerAPI.load_shedding")
 
 DEFAULT_ALLOWED = {
     "http://localhost:5173",
@@ -31,3 +47,192 @@ class AllowAllCORSMiddleware:
             response["Access-Control-Allow-Credentials"] = "true"
             response["Access-Control-Expose-Headers"] = "Content-Type"
         return response
+
+
+class PerformanceMiddleware:
+    """
+    Per request: wall time, query count and SQL time, named timings
+    (serializer, password hashing) and response size. Emitted as a
+    ``Server-Timing`` header (when PERFORMANCE_SERVER_TIMING is on), one JSON
+    log line on ``tasktrackerAPI.requests``, and one line per sampled slow
+    query on ``tasktrackerAPI.slow_queries``. Works under WSGI and ASGI;
+    place it first in MIDDLEWARE so the timings cover the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        metrics.install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        collected, token = metrics.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return self.report(request, response, collected)
+
+    async def __acall__(self, request):
+        collected, token = metrics.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return self.report(request, response, collected)
+
+    def report(self, request, response, collected):
+        total_ms = collected.elapsed_ms
+        if settings.PERFORMANCE_SERVER_TIMING:
+            entries = [
+                f"total;dur={total_ms:.1f}",
+                f'db;dur={collected.sql_ms:.1f};desc="{collected.queries} queries"',
+            ]
+            entries += [f"{name};dur={ms:.1f}" for name, ms in collected.timings.items()]
+            response["Server-Timing"] = ", ".join(entries)
+
+        match = request.resolver_match
+        view = match.view_name if match else None
+        size = None if response.streaming else len(response.content)
+        request_logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": view,
+                    "status": response.status_code,
+                    "duration_ms": round(total_ms, 2),
+                    "db_queries": collected.queries,
+                    "db_ms": round(collected.sql_ms, 2),
+                    **{f"{name}_ms": round(ms, 2) for name, ms in collected.timings.items()},
+                    "response_bytes": size,
+                }
+            )
+        )
+        for ms, sql in collected.slow_queries:
+            slow_query_logger.warning(
+                json.dumps({"view": view, "path": request.path, "duration_ms": round(ms, 2), "sql": sql})
+            )
+        return response
+
+
+def queue_ms(request, now):
+    """
+    Time the request waited in front of the app, from the router's
+    ``X-Request-Start`` (Heroku: epoch ms; nginx: ``t=`` epoch seconds or µs).
+    """
+    value = request.headers.get("X-Request-Start", "").removeprefix("t=")
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, (now - started) * 1000)
+
+
+class LoadSheddingMiddleware:
+    """
+    Answer 503 with Retry-After, before any real work, while this process is
+    overloaded: the request queued longer than LOAD_SHED_QUEUE_MS, more than
+    LOAD_SHED_MAX_IN_FLIGHT requests are already running, or the moving
+    average response time is above LOAD_SHED_LATENCY_MS. The latency check
+    sheds a share of requests that grows with the overshoot, so the
+    requests still served keep the average current. Every check is off at 0.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.latency_ms = 0.0
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        reason = self.shed_reason(request)
+        if reason:
+            return self.shed(request, reason)
+        started = self.enter()
+        try:
+            return self.get_response(request)
+        finally:
+            self.exit(started)
+
+    async def __acall__(self, request):
+        reason = self.shed_reason(request)
+        if reason:
+            return self.shed(request, reason)
+        started = self.enter()
+        try:
+            return await self.get_response(request)
+        finally:
+            self.exit(started)
+
+    def shed_reason(self, request):
+        if request.method == "OPTIONS":
+            return None
+        limit = settings.LOAD_SHED_QUEUE_MS
+        if limit:
+            waited = queue_ms(request, time.time())
+            if waited is not None and waited > limit:
+                return "queue"
+        limit = settings.LOAD_SHED_MAX_IN_FLIGHT
+        if limit and self.in_flight >= limit:
+            return "in_flight"
+        limit = settings.LOAD_SHED_LATENCY_MS
+        if limit and self.latency_ms > limit:
+            if random.random() < min(0.9, (self.latency_ms - limit) / limit):
+                return "latency"
+        return None
+
+    def shed(self, request, reason):
+        shed_logger.warning(
+            json.dumps({"reason": reason, "path": request.path, "in_flight": self.in_flight,
+                        "latency_ms": round(self.latency_ms, 2)})
+        )
+        return JsonResponse(
+            {"detail": "Server busy, try again shortly."},
+            status=503,
+            headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+        )
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def exit(self, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.in_flight -= 1
+            self.latency_ms += 0.1 * (elapsed_ms - self.latency_ms)  # EWMA
+
+
+class HashingBusyMiddleware(MiddlewareMixin):
+    """
+    Answer 503 with Retry-After when a view's password check couldn't get a
+    hashing slot (accounts.hashers.HashingBusy), e.g. the admin login form.
+    The API's login and register views answer it themselves.
+    """
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, HashingBusy):
+            return JsonResponse(
+                {"detail": "Server busy, try again shortly."}, status=503, headers={"Retry-After": "1"}
+            )
+        return None
@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -61,10 +62,16 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "tasktrackerAPI.middleware.PerformanceMiddleware",   # first, so timings cover everything
+    "tasktrackerAPI.db_router.ReplicaPinningMiddleware",  # primary-only after writes (no-op without replicas)
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
 
     "corsheaders.middleware.CorsMiddleware",      # CORS should be as high as possible
+    # Before any real work, but inside CORS so browsers can read its 503s
+    # (no-op unless LOAD_SHED_* set).
+    "tasktrackerAPI.middleware.LoadSheddingMiddleware",
+    "tasktrackerAPI.middleware.HashingBusyMiddleware",  # 503 when password hashing is saturated
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -75,13 +82,41 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",  # default protect; open specific views as needed
     ),
+    # Per-user and per-IP budgets for reads, writes and auth (see tasktrackerAPI.throttling).
+    "DEFAULT_THROTTLE_CLASSES": (
+        "tasktrackerAPI.throttling.UserThrottle",
+        "tasktrackerAPI.throttling.IPThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "read": os.getenv("THROTTLE_READ", "600/min"),
+        "write": os.getenv("THROTTLE_WRITE", "120/min"),
+        "auth": os.getenv("THROTTLE_AUTH", "10/min"),
+        "read_ip": os.getenv("THROTTLE_READ_IP", "1200/min"),
+        "write_ip": os.getenv("THROTTLE_WRITE_IP", "300/min"),
+        "auth_ip": os.getenv("THROTTLE_AUTH_IP", "30/min"),
+    },
+    # Proxies in front of the app (Heroku's router is one), so client IPs
+    # come from the right X-Forwarded-For entry and can't be spoofed by
+    # sending the header. 0 uses REMOTE_ADDR.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "1")),
 }
 
+# Throttle counters must be shared by all workers; the default cache is
+# Redis in production (per-process memory locally).
+THROTTLE_CACHE = os.getenv("THROTTLE_CACHE", "default")
+THROTTLING_ENABLED = os.getenv("THROTTLING_ENABLED", "true").lower() == "true"
+
+# Load shedding (see tasktrackerAPI.middleware.LoadSheddingMiddleware); 0 disables each check.
+LOAD_SHED_QUEUE_MS = float(os.getenv("LOAD_SHED_QUEUE_MS", "0"))      # router queue wait (X-Request-Start)
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "0"))  # concurrent requests per process
+LOAD_SHED_LATENCY_MS = float(os.getenv("LOAD_SHED_LATENCY_MS", "0"))  # moving average response time
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "2"))
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
@@ -89,8 +124,23 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.tokens.RefreshTokenSerializer",
 }
 
+# Cache alias used for refresh-token blacklist lookups (see accounts.blacklist).
+# Must be shared by all workers, so it is only enabled with Redis by default.
+TOKEN_BLACKLIST_CACHE = os.getenv(
+    "TOKEN_BLACKLIST_CACHE", "default" if os.getenv("REDIS_URL") else ""
+)
+# Seconds between rebuilds of that cache from the database, which bounds how
+# long a jti key evicted under memory pressure could go unnoticed.
+TOKEN_BLACKLIST_WARM_SECONDS = int(os.getenv("TOKEN_BLACKLIST_WARM_SECONDS", "300"))
+
+# In-process cache of authenticated users (see accounts.authentication).
+# TTL bounds how long a change made in another process can go unseen; 0 disables.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+
 
 ROOT_URLCONF = 'tasktrackerAPI.urls'
 
@@ -115,11 +165,43 @@ WSGI_APPLICATION = 'tasktrackerAPI.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_POOL picks how Postgres connections are managed:
+# - "" (default): one persistent connection per worker thread, kept for
+#   CONN_MAX_AGE seconds and health-checked before reuse, so a connection
+#   dropped by the server fails the check instead of the next request.
+# - "psycopg": Django's psycopg 3 pool, shared by the threads of a worker
+#   process. Connections are warmed up front and returned after each request.
+# - "pgbouncer": DATABASE_URL points at PgBouncer in transaction pooling
+#   mode, which can't keep server-side cursors open across transactions.
+DATABASE_POOL = os.getenv("DATABASE_POOL", "").lower()
+if DATABASE_POOL not in ("", "psycopg", "pgbouncer"):
+    raise ImproperlyConfigured("DATABASE_POOL must be empty, 'psycopg' or 'pgbouncer'.")
+
 if os.getenv("DATABASE_URL"):
     # --- Use Heroku Postgres in production ---
+    # The pool owns connection lifetime, so Django must not persist them too.
+    conn_max_age = 0 if DATABASE_POOL == "psycopg" else int(os.getenv("CONN_MAX_AGE", "600"))
     DATABASES = {
-        "default": dj_database_url.config(conn_max_age=600, ssl_require=True)
+        "default": dj_database_url.config(
+            conn_max_age=conn_max_age,
+            conn_health_checks=conn_max_age > 0,
+            ssl_require=True,
+        )
     }
+    if DATABASE_POOL == "psycopg":
+        from psycopg_pool import ConnectionPool
+
+        # Enough for every thread of a worker (gunicorn.conf.py) to hold a connection.
+        pool_max_size = int(os.getenv("DATABASE_POOL_MAX_SIZE", os.getenv("GUNICORN_THREADS", "1")))
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", str(pool_max_size))),
+            "max_size": pool_max_size,
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+            # Replaces CONN_HEALTH_CHECKS: test each connection on checkout.
+            "check": ConnectionPool.check_connection,
+        }
+    elif DATABASE_POOL == "pgbouncer":
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
 else:
     # --- Use SQLite locally ---
     DATABASES = {
@@ -129,6 +211,86 @@ else:
         }
     }
 
+# Read replicas: DATABASE_REPLICA_URLS is a comma-separated list of URLs in
+# the same format as DATABASE_URL (sqlite:/// URLs work for local testing).
+# Reads are spread across them; writes, and reads after a write in the same
+# request or within REPLICA_PIN_SECONDS for the same client, use the primary.
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")), 1):
+    alias = f"replica{number}"
+    primary = DATABASES["default"]
+    replica = dj_database_url.parse(
+        url.strip(),
+        conn_max_age=primary.get("CONN_MAX_AGE", 0),
+        conn_health_checks=primary.get("CONN_HEALTH_CHECKS", False),
+        ssl_require=url.strip().startswith("postgres"),
+    )
+    if "pool" in primary.get("OPTIONS", {}):
+        replica["OPTIONS"]["pool"] = dict(primary["OPTIONS"]["pool"])
+    replica["DISABLE_SERVER_SIDE_CURSORS"] = primary.get("DISABLE_SERVER_SIDE_CURSORS", False)
+    replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[alias] = replica
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["tasktrackerAPI.db_router.ReplicaRouter"] if DATABASE_REPLICAS else []
+REPLICA_PIN_COOKIE = "db_primary_pin"
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
+
+# Cache
+# Shared Redis cache when REDIS_URL is set, per-process memory otherwise.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Cached task data is invalidated by bumping version counters in the cache
+# (see tasks/cache.py), and other workers only see a bump through a shared
+# cache. Without Redis each worker's counters expire after this many
+# seconds (0 = never), which bounds how long it can serve stale summaries,
+# category lists and ETags after another worker's write.
+CACHE_VERSION_TIMEOUT = int(
+    os.getenv("CACHE_VERSION_TIMEOUT", "0" if os.getenv("REDIS_URL") else "5")
+) or None
+
+# Seconds a user's /api/tasks/summary/ stays cached (0 disables). Entries are
+# also invalidated whenever one of the user's tasks changes.
+TASK_SUMMARY_CACHE_TIMEOUT = int(os.getenv("TASK_SUMMARY_CACHE_TIMEOUT", "60"))
+# Seconds the category list stays cached (0 disables). Category save/delete
+# invalidates it at once through a shared cache; without one, other workers
+# refresh within CACHE_VERSION_TIMEOUT.
+CATEGORY_CACHE_TIMEOUT = int(os.getenv("CATEGORY_CACHE_TIMEOUT", "86400"))
+# Seconds the Task admin caches list-filter facet counts (0 disables).
+ADMIN_FACET_CACHE_TIMEOUT = int(os.getenv("ADMIN_FACET_CACHE_TIMEOUT", "300"))
+
+# Render task list GETs from values() rows with orjson (if installed) instead
+# of TaskSerializer + JSONRenderer; the bytes are identical. See tasks/fastjson.py.
+TASK_LIST_FAST_JSON = os.getenv("TASK_LIST_FAST_JSON", "true").lower() == "true"
+
+# Seconds /api/tasks/changes/ re-sends on the next sync, to catch rows
+# whose transaction committed after a later-stamped row was already sent.
+# Must exceed the longest write transaction (and clock skew between servers).
+SYNC_SAFETY_SECONDS = int(os.getenv("SYNC_SAFETY_SECONDS", "60"))
+
+# Largest upload POST /api/tasks/import/ accepts (0 = no limit). The import
+# runs inside the request, so bigger files belong to `manage.py import_tasks`.
+TASK_IMPORT_MAX_BYTES = int(os.getenv("TASK_IMPORT_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# "wsgi" (default) or "asgi"; see gunicorn.conf.py. Under ASGI the task
+# list/detail GETs are served by the async views in tasks/async_views.py.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+TASKS_ASYNC_VIEWS = SERVER_MODE == "asgi"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -149,6 +311,61 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+PASSWORD_HASHERS = [
+    "accounts.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# PBKDF2 cost; unset/0 keeps Django's default. Existing hashes are re-encoded
+# at the new cost on each user's next login.
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "0"))
+
+# Login/registration hash on a bounded pool (see accounts.hashers); requests
+# that wait longer than the timeout for a slot get a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+
+AUTHENTICATION_BACKENDS = ["accounts.backends.PooledModelBackend"]
+
+
+# Request instrumentation (tasktrackerAPI.middleware.PerformanceMiddleware).
+# Server-Timing reveals query counts/timings to clients, so it is off in
+# production unless enabled explicitly.
+PERFORMANCE_SERVER_TIMING = os.getenv("PERFORMANCE_SERVER_TIMING", str(DEBUG)).lower() == "true"
+# Queries at least this slow (ms) are logged, SLOW_QUERY_SAMPLE_RATE of the time.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "0.1"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        # Performance loggers already emit JSON; keep lines machine-parseable.
+        "json": {"format": '{"time": "%(asctime)s", "logger": "%(name)s", "event": %(message)s}'},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "performance": {"class": "logging.StreamHandler", "formatter": "json"},
+    },
+    "loggers": {
+        "tasktrackerAPI.requests": {
+            "handlers": ["performance"],
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+        "tasktrackerAPI.slow_queries": {
+            "handlers": ["performance"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+    "root": {"handlers": ["console"], "level": "WARNING"},
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
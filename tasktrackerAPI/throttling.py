@@ -0,0 +1,126 @@
+"""
+Per-user and per-IP request throttles with separate read/write/auth budgets.
+
+Counts live in the shared cache (THROTTLE_CACHE) so every worker enforces
+the same budget. Each client gets a counter per fixed window, bumped with
+the cache's atomic ``add``/``incr``, and the request rate is estimated as a
+sliding window: the current count plus the previous window's count weighted
+by how much of it still overlaps. That gives the steady rate and burst cap
+of a token bucket of size N refilled at N per period, without a
+read-modify-write that a plain cache can't do atomically.
+
+Rejected requests count too, so a client looping on 429s stays limited
+until it backs off. If the cache is unreachable, requests are let through.
+"""
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """``"120/min"`` -> ``(120, 60)``; None for no limit."""
+    if not rate:
+        return None
+    count, period = rate.split("/")
+    return int(count), PERIODS[period[0]]
+
+
+def hit(key, limit, period, now=None):
+    """
+    Count one request against ``key``. Returns 0 if it is within ``limit``
+    per ``period``, else the seconds until it would be.
+    """
+    cache = caches[settings.THROTTLE_CACHE]
+    now = time.time() if now is None else now
+    window, elapsed = divmod(now, period)
+    current_key, previous_key = f"{key}:{int(window)}", f"{key}:{int(window) - 1}"
+    cache.add(current_key, 0, period * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:  # expired between add() and incr()
+        cache.set(current_key, 1, period * 2)
+        current = 1
+    previous = cache.get(previous_key, 0)
+    overlap = 1 - elapsed / period
+    if previous * overlap + current <= limit:
+        return 0
+    if current > limit or not previous:
+        return period - elapsed  # over budget until this window ends
+    # The previous window's weight shrinks as time passes.
+    return (previous * overlap + current - limit) * period / previous
+
+
+class ScopedThrottle(BaseThrottle):
+    """
+    Budget by scope: views may set ``throttle_scope = "auth"``; otherwise
+    safe methods count as "read" and everything else as "write". Rates come
+    from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] under ``scope + suffix``.
+    """
+
+    suffix = ""
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def scope(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope:
+            return scope
+        return "read" if request.method in SAFE_METHODS else "write"
+
+    def ident(self, request, scope):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLING_ENABLED:
+            return True
+        scope = self.scope(request, view)
+        rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope + self.suffix))
+        if rate is None:
+            return True
+        key = f"throttle:{scope}{self.suffix}:{self.ident(request, scope)}"
+        try:
+            self.wait_seconds = hit(key, *rate)
+        except Exception:
+            logger.exception("Throttle cache unavailable; not throttling")
+            return True
+        return not self.wait_seconds
+
+    def wait(self):
+        return math.ceil(self.wait_seconds) if self.wait_seconds else None
+
+
+class UserThrottle(ScopedThrottle):
+    """
+    Per authenticated user. Anonymous auth requests are keyed on the
+    submitted username (guessing one account's password from many IPs),
+    other anonymous requests on the client IP.
+    """
+
+    def ident(self, request, scope):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        if scope == "auth" and isinstance(request.data, dict):
+            username = request.data.get("username")
+            if isinstance(username, str) and username:
+                return f"username:{username.casefold()[:150]}"
+        return f"ip:{self.get_ident(request)}"
+
+
+class IPThrottle(ScopedThrottle):
+    """Per client IP, across all accounts used from it (rates ``<scope>_ip``)."""
+
+    suffix = "_ip"
+
+    def ident(self, request, scope):
+        return self.get_ident(request)